@@ -0,0 +1,478 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: A bitboard engine for Janggi, which can be used instead of the object board of JanggiGame.
+from JanggiTables import (SQUARE_NAME, SQUARE_INDEX, SQUARE_ROW, SQUARE_COL, PLAYERS, ROLES, STEP_TABLE, HORSE_MOVE,
+                          ELEPHANT_MOVE, PALACE_RAY)
+
+# The bit of every square id (a board is a 90-bit Python int)
+BIT = [1 << square for square in range(90)]
+FULL_RANK = 0x1FF
+FULL_FILE = 0x3FF
+# The opening layout of every player
+START_LAYOUT = {
+    "red": {"Chariot": ["a1", "i1"], "Elephant": ["b1", "g1"], "Horse": ["c1", "h1"], "Guard": ["d1", "f1"],
+            "General": ["e2"], "Cannon": ["b3", "h3"], "Soldier": ["a4", "c4", "e4", "g4", "i4"]},
+    "blue": {"Chariot": ["a10", "i10"], "Elephant": ["b10", "g10"], "Horse": ["c10", "h10"], "Guard": ["d10", "f10"],
+             "General": ["e9"], "Cannon": ["b8", "h8"], "Soldier": ["a7", "c7", "e7", "g7", "i7"]}}
+
+
+def build_line_slide(length):
+    """
+    Takes a parameter that represents the length of a line (9 for a rank, 10 for a file).
+    Returns the table (indexed by the index on the line, then by the line's occupancy) of the Chariot's attacks.
+    """
+    table = []
+    for index in range(length):
+        row = []
+        for occupied in range(1 << length):
+            attack = 0
+            for step in (1, -1):
+                other = index + step
+                while 0 <= other < length:
+                    attack |= 1 << other
+                    if occupied >> other & 1:
+                        break
+                    other += step
+            row.append(attack)
+        table.append(row)
+    return table
+
+
+def build_line_jump(length):
+    """
+    Takes a parameter that represents the length of a line (9 for a rank, 10 for a file).
+    Returns the table (indexed by the index on the line, then by the line's occupancy) of the Cannon's
+    (screen index, attacks) pairs for both directions. The screen index is -1 when there is no screen.
+    """
+    table = []
+    for index in range(length):
+        row = []
+        for occupied in range(1 << length):
+            pairs = []
+            for step in (1, -1):
+                other = index + step
+                # Finds the screen
+                while 0 <= other < length and not occupied >> other & 1:
+                    other += step
+                if not 0 <= other < length:
+                    pairs.append((-1, 0))
+                    continue
+                screen = other
+                attack = 0
+                other += step
+                while 0 <= other < length:
+                    attack |= 1 << other
+                    if occupied >> other & 1:
+                        break
+                    other += step
+                pairs.append((screen, attack))
+            row.append(tuple(pairs))
+        table.append(row)
+    return table
+
+
+def build_file_spread():
+    """
+    Returns the table that converts the 10 bits of a file into the bits of column "a" on the board.
+    """
+    table = []
+    for local in range(1 << 10):
+        board = 0
+        for row in range(10):
+            if local >> row & 1:
+                board |= BIT[row * 9]
+        table.append(board)
+    return table
+
+
+def build_reverse(table):
+    """
+    Takes a parameter that represents a step table (indexed by the square id).
+    Returns the bit masks (indexed by the square id) of the squares that can step to each square.
+    """
+    reverse = [0] * 90
+    for square in range(90):
+        for end in table[square]:
+            reverse[end] |= BIT[square]
+    return reverse
+
+
+def build_reverse_leg(table):
+    """
+    Takes a parameter that represents a list (indexed by the square id) of (legs mask, target) pairs.
+    Returns the list (indexed by the target square id) of the (legs mask, square) pairs that reach each square.
+    """
+    reverse = [[] for _ in range(90)]
+    for square in range(90):
+        for legs, target in table[square]:
+            reverse[target].append((legs, square))
+    return reverse
+
+
+# Sliding lookups of the Chariot and the Cannon along the ranks and the files
+RANK_SLIDE = build_line_slide(9)
+FILE_SLIDE = build_line_slide(10)
+RANK_JUMP = build_line_jump(9)
+FILE_JUMP = build_line_jump(10)
+FILE_SPREAD = build_file_spread()
+# The Horse's (leg bit, targets mask) pairs and the Elephant's (legs mask, target bit) pairs
+HORSE_ATTACK = [[(BIT[leg], sum(BIT[target] for other, target in HORSE_MOVE[square] if other == leg))
+                 for leg in sorted(set(leg for leg, target in HORSE_MOVE[square]))] for square in range(90)]
+ELEPHANT_ATTACK = [[(BIT[first_leg] | BIT[second_leg], BIT[target])
+                    for (first_leg, second_leg), target in ELEPHANT_MOVE[square]] for square in range(90)]
+# The (legs mask, square) pairs from which a Horse or an Elephant can attack each square
+HORSE_REVERSE = build_reverse_leg([[(BIT[leg], target) for leg, target in moves] for moves in HORSE_MOVE])
+ELEPHANT_REVERSE = build_reverse_leg([[(BIT[first_leg] | BIT[second_leg], target)
+                                       for (first_leg, second_leg), target in moves] for moves in ELEPHANT_MOVE])
+# The step masks of the roles that cannot be blocked, and the squares that can step to each square
+STEP_ATTACK = {key: [sum(BIT[end] for end in targets) for targets in table] for key, table in STEP_TABLE.items()}
+STEP_REVERSE = {key: build_reverse(table) for key, table in STEP_TABLE.items()}
+
+
+def iterate_bits(board):
+    """
+    Takes a parameter that represents a board (int).
+    Yields the square id of every bit on the board.
+    """
+    while board:
+        low = board & -board
+        yield low.bit_length() - 1
+        board ^= low
+
+
+class BitboardJanggiGame:
+    """
+    Represents a Janggi game stored as bitboards (one 90-bit int per player and role).
+    It follows the same make_move / is_in_check / get_game_state contract as JanggiGame:
+    a move is legal when it does not leave its own General attacked, and a player is checkmated
+    when it is in check and has no legal move left.
+    """
+
+    def __init__(self):
+        """
+        Creates a bitboard game with different private data members and initializes all data members.
+        """
+        # The bitboard of every (player, role)
+        self._pieces = {player: {role: 0 for role in ROLES} for player in PLAYERS}
+        # The occupancy of every player, the whole occupancy and the same occupancy stored file by file
+        self._occupied = {player: 0 for player in PLAYERS}
+        self._occupied_all = 0
+        self._occupied_file = 0
+        # The (player, role) on every square, which is used to find the captured piece
+        self._mailbox = [None] * 90
+        self._game_state = "UNFINISHED"
+        self._whose_turn = "blue"
+        self._in_check = {player: False for player in PLAYERS}
+        # The undo stack of (start, end, captured, whose turn, in check, game state) of the moves made so far
+        self._history = []
+        for player in PLAYERS:
+            for role, positions in START_LAYOUT[player].items():
+                for position in positions:
+                    self.put_piece(player, role, SQUARE_INDEX[position])
+
+    def get_game_state(self):
+        """
+        Returns one of these values, depending on the game state: "UNFINISHED" or "RED_WON" or "BLUE_WON".
+        """
+        return self._game_state
+
+    def get_whose_turn(self):
+        """
+        Returns the player whose turn.
+        """
+        return self._whose_turn
+
+    def get_pieces(self, player, role):
+        """
+        Takes two parameters that represent the player and the role.
+        Returns the bitboard of these pieces.
+        """
+        return self._pieces[player][role]
+
+    def get_board(self):
+        """
+        Returns the board as a dictionary, which stores the positions (ex. "b3" and "a10") as keys
+        and stores the (player, role) pairs on the positions as values.
+        """
+        return dict(zip(SQUARE_NAME, self._mailbox))
+
+    def is_in_check(self, player):
+        """
+        Takes as a parameter either "red" or "blue" and returns True if that player is in check,
+        but returns False otherwise.
+        """
+        return self._in_check.get(player, False)
+
+    def put_piece(self, player, role, square):
+        """
+        Takes three parameters that represent the player, the role and the square id.
+        Puts the piece on the (empty) square.
+        """
+        bit = BIT[square]
+        self._pieces[player][role] |= bit
+        self._occupied[player] |= bit
+        self._occupied_all |= bit
+        self._occupied_file |= 1 << (SQUARE_COL[square] * 10 + SQUARE_ROW[square])
+        self._mailbox[square] = (player, role)
+
+    def remove_piece(self, square):
+        """
+        Takes a parameter that represents the square id.
+        Removes the piece on the square and returns its (player, role), or None when the square is empty.
+        """
+        content = self._mailbox[square]
+        if content is None:
+            return None
+        player, role = content
+        bit = BIT[square]
+        self._pieces[player][role] ^= bit
+        self._occupied[player] ^= bit
+        self._occupied_all ^= bit
+        self._occupied_file ^= 1 << (SQUARE_COL[square] * 10 + SQUARE_ROW[square])
+        self._mailbox[square] = None
+        return content
+
+    def chariot_attack(self, square):
+        """
+        Takes a parameter that represents the square id.
+        Returns the squares (mask) that a Chariot on the square attacks.
+        """
+        row, column = SQUARE_ROW[square], SQUARE_COL[square]
+        occupied = self._occupied_all
+        attack = RANK_SLIDE[column][occupied >> (row * 9) & FULL_RANK] << (row * 9)
+        attack |= FILE_SPREAD[FILE_SLIDE[row][self._occupied_file >> (column * 10) & FULL_FILE]] << column
+        # Along the palace's diagonal lines
+        for ray in PALACE_RAY[square]:
+            for end in ray:
+                attack |= BIT[end]
+                if occupied & BIT[end]:
+                    break
+        return attack
+
+    def cannon_attack(self, square):
+        """
+        Takes a parameter that represents the square id.
+        Returns the squares (mask) that a Cannon on the square attacks by jumping over exactly one screen,
+        which cannot be another Cannon.
+        """
+        row, column = SQUARE_ROW[square], SQUARE_COL[square]
+        occupied = self._occupied_all
+        cannons = self._pieces["blue"]["Cannon"] | self._pieces["red"]["Cannon"]
+        attack = 0
+        for screen, local in RANK_JUMP[column][occupied >> (row * 9) & FULL_RANK]:
+            if screen >= 0 and not cannons & BIT[row * 9 + screen]:
+                attack |= local << (row * 9)
+        for screen, local in FILE_JUMP[row][self._occupied_file >> (column * 10) & FULL_FILE]:
+            if screen >= 0 and not cannons & BIT[screen * 9 + column]:
+                attack |= FILE_SPREAD[local] << column
+        # Along the palace's diagonal lines (from a corner over the center)
+        for ray in PALACE_RAY[square]:
+            if len(ray) == 2 and occupied & BIT[ray[0]] and not cannons & BIT[ray[0]]:
+                attack |= BIT[ray[1]]
+        return attack
+
+    def piece_attack(self, player, role, square):
+        """
+        Takes three parameters that represent the player, the role and the square id.
+        Returns the squares (mask) that the piece attacks, including the squares of its own pieces.
+        """
+        if role == "Chariot":
+            return self.chariot_attack(square)
+        if role == "Cannon":
+            # Cannons cannot capture other Cannons
+            return self.cannon_attack(square) & ~(self._pieces["blue"]["Cannon"] | self._pieces["red"]["Cannon"])
+        occupied = self._occupied_all
+        if role == "Horse":
+            attack = 0
+            for leg, targets in HORSE_ATTACK[square]:
+                if not occupied & leg:
+                    attack |= targets
+            return attack
+        if role == "Elephant":
+            attack = 0
+            for legs, target in ELEPHANT_ATTACK[square]:
+                if not occupied & legs:
+                    attack |= target
+            return attack
+        return STEP_ATTACK[(role, player)][square]
+
+    def is_attacked(self, square, player):
+        """
+        Takes two parameters that represent the square id and the attacking player.
+        Returns True when any piece of that player attacks the square.
+        """
+        pieces = self._pieces[player]
+        occupied = self._occupied_all
+        if self.chariot_attack(square) & pieces["Chariot"]:
+            return True
+        if self.cannon_attack(square) & pieces["Cannon"]:
+            return True
+        for leg, horse in HORSE_REVERSE[square]:
+            if pieces["Horse"] & BIT[horse] and not occupied & leg:
+                return True
+        for legs, elephant in ELEPHANT_REVERSE[square]:
+            if pieces["Elephant"] & BIT[elephant] and not occupied & legs:
+                return True
+        for role in ("Soldier", "Guard", "General"):
+            if STEP_REVERSE[(role, player)][square] & pieces[role]:
+                return True
+        return False
+
+    def get_general_pos(self, player):
+        """
+        Takes a parameter that represents the player.
+        Returns that player's general square id (None when it is not on the board).
+        """
+        general = self._pieces[player]["General"]
+        if general == 0:
+            return None
+        return general.bit_length() - 1
+
+    def in_check_now(self, player):
+        """
+        Takes a parameter that represents the player.
+        Returns True when the player's General is attacked on the current board.
+        """
+        general_pos = self.get_general_pos(player)
+        if general_pos is None:
+            return False
+        return self.is_attacked(general_pos, self.opponent(player))
+
+    def opponent(self, player):
+        """
+        Takes a parameter that represents the player.
+        Returns the other player.
+        """
+        return "red" if player == "blue" else "blue"
+
+    def generate_moves(self, player, legal=True):
+        """
+        Takes a parameter that represents the player and an optional flag.
+        Yields the (start square id, end square id) pairs of the player's moves.
+        If legal is True, the moves that leave the own General in check are filtered out.
+        """
+        own = self._occupied[player]
+        for role in ROLES:
+            for square in iterate_bits(self._pieces[player][role]):
+                for end in iterate_bits(self.piece_attack(player, role, square) & ~own):
+                    if legal:
+                        captured = self.apply_move(square, end)
+                        in_check = self.in_check_now(player)
+                        self.undo_move(square, end, captured)
+                        if in_check:
+                            continue
+                    yield square, end
+
+    def apply_move(self, start, end):
+        """
+        Takes two parameters that represent the start and the end square ids.
+        Moves the piece and returns the captured (player, role), or None when nothing is captured.
+        """
+        player, role = self.remove_piece(start)
+        captured = self.remove_piece(end)
+        self.put_piece(player, role, end)
+        return captured
+
+    def undo_move(self, start, end, captured):
+        """
+        Takes three parameters that represent the start and end square ids and the captured (player, role).
+        Takes back a move applied by apply_move.
+        """
+        player, role = self.remove_piece(end)
+        self.put_piece(player, role, start)
+        if captured is not None:
+            self.put_piece(captured[0], captured[1], end)
+
+    def has_legal_move(self, player):
+        """
+        Takes a parameter that represents the player.
+        Returns True when the player has at least one legal move (stops at the first one found).
+        """
+        for start, end in list(self.generate_moves(player, legal=False)):
+            captured = self.apply_move(start, end)
+            in_check = self.in_check_now(player)
+            self.undo_move(start, end, captured)
+            if not in_check:
+                return True
+        return False
+
+    def push_move(self, start, end):
+        """
+        Takes two parameters that represent the square ids to move from and to (the same square id passes the turn).
+        Makes the move without checking it and updates whose turn it is. It can be taken back by pop_move.
+        """
+        captured = None
+        if start != end:
+            captured = self.apply_move(start, end)
+        self._history.append((start, end, captured, self._whose_turn, dict(self._in_check), self._game_state))
+        self._whose_turn = self.opponent(self._whose_turn)
+
+    def pop_move(self):
+        """
+        Takes back the last move pushed by push_move (or made by make_move).
+        Returns False when there is no move to take back, otherwise returns True.
+        """
+        if len(self._history) == 0:
+            return False
+        start, end, captured, self._whose_turn, self._in_check, self._game_state = self._history.pop()
+        if start != end:
+            self.undo_move(start, end, captured)
+        return True
+
+    def make_move(self, start_pos, end_pos):
+        """
+        Takes two parameters (strings) that represent the square to move from and the square to move to.
+        Returns False when the move is not legal or the game has already been won,
+        otherwise makes the move, updates the game state and whose turn it is, and returns True.
+        Passing the same string twice passes the turn (not allowed when being in check).
+        """
+        start = SQUARE_INDEX.get(start_pos)
+        end = SQUARE_INDEX.get(end_pos)
+        if start is None or end is None or self._mailbox[start] is None:
+            return False
+        if self._game_state != "UNFINISHED":
+            return False
+        player = self._whose_turn
+
+        # Pass a turn
+        if start == end:
+            if self._in_check[player]:
+                return False
+            self.push_move(start, end)
+            return True
+
+        # The piece must belong to the player whose turn it is and the move must follow its role
+        owner, role = self._mailbox[start]
+        if owner != player:
+            return False
+        if not self.piece_attack(owner, role, start) & ~self._occupied[owner] & BIT[end]:
+            return False
+        # Cannot leave the own General in check
+        self.push_move(start, end)
+        if self.in_check_now(player):
+            self.pop_move()
+            return False
+
+        opponent = self.opponent(player)
+        self._in_check[player] = False
+        self._in_check[opponent] = self.in_check_now(opponent)
+        if self._in_check[opponent] and not self.has_legal_move(opponent):
+            self._game_state = "BLUE_WON" if player == "blue" else "RED_WON"
+        return True
+
+
+if __name__ == '__main__':
+    # Benchmark - replays the same opening on both engines
+    import time
+    from JanggiGame import JanggiGame
+
+    opening = [("c7", "c6"), ("c1", "d3"), ("b10", "d7"), ("b3", "e3"), ("c10", "d8"), ("h1", "g3"), ("e7", "e6"),
+               ("e3", "e6"), ("h8", "c8"), ("d3", "e5"), ("c8", "c4"), ("e5", "c4"), ("i10", "i8"), ("g4", "f4")]
+    for engine in (JanggiGame, BitboardJanggiGame):
+        start_time = time.perf_counter()
+        for _ in range(20):
+            game = engine()
+            for start_pos, end_pos in opening:
+                game.make_move(start_pos, end_pos)
+        elapsed = time.perf_counter() - start_time
+        print(engine.__name__, round(20 * len(opening) / elapsed), "moves per second")
@@ -0,0 +1,192 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: The presentation layer of JanggiGame (rendering and printing the board), which is only imported when
+# rendering, so the rules engine has no third-party dependencies.
+try:
+    from termcolor import colored
+except ImportError:
+    def colored(text, color):
+        """
+        Takes two parameters that represent the text and its color.
+        Returns the text without color (used when termcolor is not installed).
+        """
+        return text
+
+from JanggiTables import SQUARE_NAME
+from JanggiGame import PIECE_LETTER, TURN_LETTER
+
+# The glyph of every role and of an empty square
+ROLE_GLYPH = {"General": "將", "Guard": "士", "Elephant": "象", "Horse": "馬", "Chariot": "車", "Soldier": "兵",
+              "Cannon": "包"}
+EMPTY_GLYPH = "空"
+# The colors of the players and of an empty square
+PIECE_COLOR = {"blue": "blue", "red": "red", None: "white"}
+# The ANSI escape codes of the colors (used by the "ansi" style, which always colors)
+ANSI_CODE = {"blue": "\033[34m", "red": "\033[31m", "white": "\033[97m"}
+ANSI_RESET = "\033[0m"
+# The letter of an empty square in the compact style
+EMPTY_LETTER = "."
+# The layout of the board: the header and the label of every row (the 10th row is labeled 0)
+HEADER = "  * a *  b *  c * d *  e * f *  g * h *  i"
+ROW_LABEL = [str(row % 10) + " | " for row in range(1, 11)]
+CELL_SEPARATOR = " | "
+# The terminal columns of a cell (the glyphs are two columns wide) and the first column of the cells
+CELL_WIDTH = 2 + len(CELL_SEPARATOR)
+FIRST_COLUMN = len(ROW_LABEL[0])
+# The styles of rendering
+STYLES = ("plain", "ansi", "compact", "termcolor")
+
+# The glyphs of every style, built when the style is first used
+_glyph_tables = {}
+
+
+def piece_key(piece):
+    """
+    Takes a parameter that represents the piece object or None.
+    Returns the (player, role) pair of the piece, or None for an empty square.
+    """
+    if piece is None:
+        return None
+    return piece.get_player(), piece.get_role()
+
+
+def get_glyphs(style):
+    """
+    Takes a parameter that represents the style ("plain", "ansi", "compact" or "termcolor").
+    Returns the dictionary that maps every (player, role) pair and None (an empty square) to its text.
+    The tables are built once and cached.
+    """
+    glyphs = _glyph_tables.get(style)
+    if glyphs is not None:
+        return glyphs
+    if style not in STYLES:
+        raise ValueError("Unknown style: " + str(style))
+    glyphs = {}
+    for key in list(PIECE_LETTER) + [None]:
+        player = None if key is None else key[0]
+        if style == "compact":
+            glyphs[key] = EMPTY_LETTER if key is None else PIECE_LETTER[key]
+            continue
+        glyph = EMPTY_GLYPH if key is None else ROLE_GLYPH[key[1]]
+        if style == "ansi":
+            glyph = ANSI_CODE[PIECE_COLOR[player]] + glyph + ANSI_RESET
+        elif style == "termcolor":
+            glyph = colored(glyph, PIECE_COLOR[player])
+        glyphs[key] = glyph
+    _glyph_tables[style] = glyphs
+    return glyphs
+
+
+def board_keys(game):
+    """
+    Takes a parameter that represents the JanggiGame object.
+    Returns the list of the (player, role) pairs (or None) of the 90 squares, indexed by the square id.
+    """
+    return [piece_key(game.search_pos(pos)) for pos in range(90)]
+
+
+def render_keys(keys, style="plain", whose_turn=None):
+    """
+    Takes parameters that represent the 90 (player, role) pairs (or None), the style and an optional player to
+    move (shown by the compact style).
+    Returns the board as one string: the header and 10 rows, or one line in the compact style.
+    """
+    glyphs = get_glyphs(style)
+    cells = [glyphs[key] for key in keys]
+    if style == "compact":
+        line = "/".join("".join(cells[start:start + 9]) for start in range(0, 90, 9))
+        if whose_turn is not None:
+            line += " " + TURN_LETTER[whose_turn]
+        return line
+    lines = [HEADER]
+    for row in range(10):
+        lines.append(ROW_LABEL[row] + CELL_SEPARATOR.join(cells[row * 9:row * 9 + 9]))
+    return "\n".join(lines)
+
+
+def render_board(game, style="plain"):
+    """
+    Takes a parameter that represents the JanggiGame object and an optional style: "plain" (no color), "ansi"
+    (ANSI colors), "compact" (one line of piece letters, ranks separated by "/", then the side to move)
+    or "termcolor" (colored by termcolor, which leaves out the colors when the output is not a terminal).
+    Returns the board as one string.
+    """
+    return render_keys(board_keys(game), style, game.get_whose_turn())
+
+
+def print_board(game):
+    """
+    Takes a parameter that represents the JanggiGame object.
+    Print out the board.
+    """
+    print(render_board(game, "termcolor"))
+
+
+class BoardRenderer:
+    """
+    Represents a renderer for a live feed of one board, which remembers the last rendered board
+    so the next frames only need the squares that changed.
+    """
+
+    def __init__(self, style="ansi", origin=(1, 1)):
+        """
+        Takes optional parameters that represent the style and the terminal (line, column) of the board's
+        top-left corner (used by the cursor moves of the "ansi" style).
+        Creates a renderer object with different private data members and initializes all data members.
+        """
+        get_glyphs(style)
+        self._style = style
+        self._origin = origin
+        # The (player, role) pairs of the last rendered board (None before the first frame)
+        self._keys = None
+
+    def get_style(self):
+        """
+        Returns the style of the renderer.
+        """
+        return self._style
+
+    def reset(self):
+        """
+        Forgets the last rendered board, so the next frame is drawn in full.
+        """
+        self._keys = None
+
+    def render(self, game):
+        """
+        Takes a parameter that represents the JanggiGame object.
+        Returns the whole board as one string and remembers it.
+        """
+        self._keys = board_keys(game)
+        return render_keys(self._keys, self._style, game.get_whose_turn())
+
+    def get_changes(self, game):
+        """
+        Takes a parameter that represents the JanggiGame object.
+        Returns the list of the (square id, old, new) changes since the last frame, where old and new are
+        (player, role) pairs or None, and remembers the board.
+        """
+        keys = board_keys(game)
+        if self._keys is None:
+            changes = [(pos, None, key) for pos, key in enumerate(keys)]
+        else:
+            changes = [(pos, old, new) for pos, (old, new) in enumerate(zip(self._keys, keys)) if old != new]
+        self._keys = keys
+        return changes
+
+    def render_changes(self, game):
+        """
+        Takes a parameter that represents the JanggiGame object.
+        Returns only what changed since the last frame (the whole board for the first frame): in the "ansi" style,
+        the cursor moves and glyphs that redraw the changed squares; otherwise one line of "square:glyph" pairs
+        (ex. "c7:. c6:P"). Returns an empty string when nothing changed.
+        """
+        if self._keys is None:
+            return self.render(game)
+        glyphs = get_glyphs(self._style)
+        changes = self.get_changes(game)
+        if self._style != "ansi":
+            return " ".join(SQUARE_NAME[pos] + ":" + glyphs[new] for pos, old, new in changes)
+        line, column = self._origin
+        return "".join("\033[{};{}H".format(line + 1 + pos // 9, column + FIRST_COLUMN + (pos % 9) * CELL_WIDTH)
+                       + glyphs[new] for pos, old, new in changes)
@@ -0,0 +1,264 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: A JanggiEngine class that picks a move for a JanggiGame position with an alpha-beta search.
+import time
+
+from JanggiTables import SQUARE_NAME, PIECE_VALUE
+from TranspositionTable import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+# The score of being checkmated (reduced by the number of plies, so faster mates are preferred)
+MATE_SCORE = 100000
+INFINITY = 1000000
+# How many nodes are searched between two checks of the clock (a node takes tens of microseconds, so the
+# budget is overshot by well under a millisecond)
+CLOCK_INTERVAL = 8
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget is used up.
+    """
+    pass
+
+
+class JanggiEngine:
+    """
+    Represents a computer player that picks the best move of a JanggiGame position, using negamax alpha-beta
+    search with iterative deepening, a transposition table and a hard time budget per move.
+    """
+
+    def __init__(self, time_ms=1000, max_depth=64, tt_size_mb=16):
+        """
+        Takes optional parameters that represent the time budget per move in milliseconds, the deepest depth to
+        search and the memory budget of the transposition table in MB.
+        Creates an engine object with different private data members and initializes all data members.
+        """
+        self._time_ms = time_ms
+        self._max_depth = max_depth
+        self._table = TranspositionTable(tt_size_mb)
+        # The deadline of the current search (perf_counter seconds)
+        self._deadline = 0
+        # The report of the last search
+        self._depth = 0
+        self._nodes = 0
+        self._score = 0
+        self._elapsed = 0
+
+    def get_table(self):
+        """
+        Returns the transposition table.
+        """
+        return self._table
+
+    def get_info(self):
+        """
+        Returns the report of the last search: the depth reached, the nodes searched, the nodes per second,
+        the score (from the view of the player to move) and the time used in milliseconds.
+        """
+        nps = 0
+        if self._elapsed > 0:
+            nps = int(self._nodes / self._elapsed)
+        return {"depth": self._depth, "nodes": self._nodes, "nps": nps, "score": self._score,
+                "time_ms": int(self._elapsed * 1000)}
+
+    def search(self, game, time_ms=None):
+        """
+        Takes a parameter that represents the JanggiGame object and an optional time budget in milliseconds.
+        Returns the best move as a (start, end) pair of strings (ex. ("c7", "c6")), which can be passed to
+        make_move. The same string twice means passing the turn. Returns None when the game has already been won
+        or the player to move has no move (checkmated).
+        The game is searched in place with push_move/pop_move and left as it was.
+        """
+        if game.get_game_state() != "UNFINISHED":
+            return None
+        if time_ms is None:
+            time_ms = self._time_ms
+        start_time = time.perf_counter()
+        self._deadline = start_time + time_ms / 1000
+        self._depth = 0
+        self._nodes = 0
+        self._score = 0
+        self._table.new_search()
+
+        player = game.get_whose_turn()
+        root_moves = self.order_moves(game, self.search_moves(game, player), None)
+        if len(root_moves) == 0:
+            self._elapsed = time.perf_counter() - start_time
+            return None
+        # Always has a move to return, even if the first iteration is not completed
+        best_move = root_moves[0]
+        history_size = len(game.get_history())
+        for depth in range(1, self._max_depth + 1):
+            # No time left to start a new depth
+            if time.perf_counter() > self._deadline:
+                break
+            try:
+                score, move = self.search_root(game, root_moves, depth)
+            except SearchTimeout:
+                # Takes back the moves of the unfinished iteration
+                while len(game.get_history()) > history_size:
+                    game.pop_move()
+                break
+            best_move = move
+            self._depth = depth
+            self._score = score
+            # Searches the best move first in the next iteration
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            # A forced mate is found
+            if abs(score) >= MATE_SCORE - self._max_depth:
+                break
+        self._elapsed = time.perf_counter() - start_time
+        return SQUARE_NAME[best_move[0]], SQUARE_NAME[best_move[1]]
+
+    def search_root(self, game, root_moves, depth):
+        """
+        Takes three parameters that represent the game, the ordered root moves and the depth.
+        Returns the (score, move) of the best root move.
+        """
+        alpha = -INFINITY
+        best_move = root_moves[0]
+        for move in root_moves:
+            if time.perf_counter() > self._deadline:
+                raise SearchTimeout()
+            game.push_move(move[0], move[1])
+            score = -self.negamax(game, depth - 1, -INFINITY, -alpha, 1)
+            game.pop_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._table.store(game.position_hash(), depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def negamax(self, game, depth, alpha, beta, ply):
+        """
+        Takes parameters that represent the game, the remaining depth, the alpha-beta window and the distance
+        from the root. Returns the score of the position from the view of the player to move.
+        """
+        self._nodes += 1
+        if self._nodes % CLOCK_INTERVAL == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        key = game.position_hash()
+        table_move = None
+        entry = self._table.probe(key)
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, table_move = entry
+            entry_score = score_from_table(entry_score, ply)
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if entry_flag == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+
+        player = game.get_whose_turn()
+        if depth <= 0:
+            return self.evaluate(game, player)
+
+        moves = self.search_moves(game, player)
+        # Checkmate (passing is not allowed when being in check)
+        if len(moves) == 0:
+            return -MATE_SCORE + ply
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in self.order_moves(game, moves, table_move):
+            game.push_move(move[0], move[1])
+            score = -self.negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            game.pop_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def search_moves(self, game, player):
+        """
+        Takes two parameters that represent the game and the player to move.
+        Returns the list of the player's legal moves ((start, end) square ids), including passing the turn
+        (the General's square twice) when the player is not in check.
+        """
+        # The check status comes from the same lines to the General as the moves
+        legal, in_check = game.moves_and_check(player)
+        moves = list(legal)
+        general_pos = game.get_general_pos(player)
+        if general_pos is not None and not in_check:
+            moves.append((general_pos, general_pos))
+        return moves
+
+    def order_moves(self, game, moves, table_move):
+        """
+        Takes parameters that represent the game, the moves and the best move stored in the transposition table.
+        Returns the moves ordered: the table move, then captures (most valuable victim first), then quiet moves
+        and passing the turn last.
+        """
+        def move_order(move):
+            if move == table_move:
+                return -INFINITY
+            if move[0] == move[1]:
+                return INFINITY
+            captured = game.search_pos(move[1])
+            if captured is None:
+                return 0
+            return PIECE_VALUE[game.search_pos(move[0]).get_role()] - 10 * PIECE_VALUE[captured.get_role()]
+
+        return sorted(moves, key=move_order)
+
+    def evaluate(self, game, player):
+        """
+        Takes two parameters that represent the game and the player.
+        Returns the static evaluation (material and piece-square values, in hundredths of a material point)
+        from the view of that player, which the game keeps up to date move by move.
+        """
+        return game.evaluate(player)
+
+
+def score_to_table(score, ply):
+    """
+    Takes two parameters that represent the score and the distance from the root.
+    Returns the score to store, where a mate score counts the plies from the stored position instead of the root.
+    """
+    if score >= MATE_SCORE - 1000:
+        return score + ply
+    if score <= -MATE_SCORE + 1000:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """
+    Takes two parameters that represent the stored score and the distance from the root.
+    Returns the score counted from the root again.
+    """
+    if score >= MATE_SCORE - 1000:
+        return score - ply
+    if score <= -MATE_SCORE + 1000:
+        return score + ply
+    return score
+
+
+if __name__ == '__main__':
+    # Example - the engine plays both sides for a few moves
+    from JanggiGame import JanggiGame
+
+    game = JanggiGame()
+    engine = JanggiEngine(time_ms=500)
+    for _ in range(6):
+        move = engine.search(game)
+        print(game.get_whose_turn(), move, engine.get_info())
+        game.make_move(*move)
+    game.print_board()
@@ -1,49 +1,131 @@
 # Author: Cheng-Ying Wu
 # Date: 03/11/2021
 # Description: A JanggiGame class for playing an abstract board game called Janggi.
-from termcolor import colored
+import sys
+from array import array
+from collections import OrderedDict
+
+from JanggiTables import (SQUARE_NAME, SQUARE_INDEX, PALACE, STEP_TABLE, HORSE_MOVE, ELEPHANT_MOVE,
+                          ORTHOGONAL_RAY, PALACE_RAY, LINE_BETWEEN, ZOBRIST_PIECE, ZOBRIST_RED_TURN, ROLES,
+                          PIECE_VALUE, PIECE_SQUARE_BLUE)
+
+# The keys of every player's pieces, which are the slots of the player's piece array
+PIECE_KEYS = ("Chariot1", "Elephant1", "Horse1", "Guard1", "General", "Guard2", "Elephant2", "Horse2", "Chariot2",
+              "Cannon1", "Cannon2", "Soldier1", "Soldier2", "Soldier3", "Soldier4", "Soldier5")
+GENERAL_SLOT = PIECE_KEYS.index("General")
+# The slots of every role (ex. "Chariot": (0, 8))
+ROLE_SLOTS = {role: tuple(slot for slot, key in enumerate(PIECE_KEYS) if key.rstrip("12345") == role)
+              for role in ROLES}
+# The square id stored in the piece array for a captured piece
+CAPTURED = -1
+CAPTURED_SQUARES = (CAPTURED,) * len(PIECE_KEYS)
+# The starting square ids of every player's pieces, in the order of PIECE_KEYS
+START_SQUARES = {
+    "blue": tuple(SQUARE_INDEX[pos] for pos in ["a10", "b10", "c10", "d10", "e9", "f10", "g10", "h10", "i10", "b8",
+                                                "h8", "a7", "c7", "e7", "g7", "i7"]),
+    "red": tuple(SQUARE_INDEX[pos] for pos in ["a1", "b1", "c1", "d1", "e2", "f1", "g1", "h1", "i1", "b3", "h3",
+                                               "a4", "c4", "e4", "g4", "i4"])}
+# The letters of the pieces in the position notation (blue is upper case, red is lower case)
+PIECE_LETTER = {}
+for _player, _case in (("blue", str.upper), ("red", str.lower)):
+    for _role, _letter in (("General", "k"), ("Guard", "a"), ("Elephant", "b"), ("Horse", "n"), ("Chariot", "r"),
+                           ("Cannon", "c"), ("Soldier", "p")):
+        PIECE_LETTER[(_player, _role)] = _case(_letter)
+LETTER_PIECE = {letter: piece for piece, letter in PIECE_LETTER.items()}
+# The letters of the side to move in the position notation
+TURN_LETTER = {"blue": "w", "red": "b"}
+LETTER_TURN = {letter: player for player, letter in TURN_LETTER.items()}
+# The square ids shared by every game (they never change)
+BOARD_POS = tuple(range(90))
+PALACE_ALL = tuple(PALACE["red"] + PALACE["blue"])
+# The values of the pieces in the exchange evaluation (a General is worth more than all the other pieces)
+GENERAL_SEE_VALUE = 100
+SEE_VALUE = dict(PIECE_VALUE, General=GENERAL_SEE_VALUE)
+# The number of recently visited positions whose legal moves are cached
+MOVE_CACHE_SIZE = 64
+# The attack maps keep the attacks of every piece at the player's offset plus the piece's slot
+PLAYER_OFFSET = {"blue": 0, "red": len(PIECE_KEYS)}
+# The offsets of the players' attack counts in the count array
+COUNT_OFFSET = {"blue": 0, "red": 90}
+# The bit of every square id in the bitmaps of the squares the attacks depend on
+SQUARE_BIT = tuple(1 << pos for pos in range(90))
 
 
 class JanggiGame:
     """
     Represents an abstract board game called Janggi for the users to play this game.
     """
+    __slots__ = ("_board_pos", "_palace_red", "_palace_blue", "_palace_all", "_board", "_game_state", "_whose_turn",
+                 "_track_blue", "_track_red", "_blue", "_red", "_history", "_listeners", "_hash", "_attack_squares",
+                 "_attack_depends", "_attack_count", "_move_cache", "_evaluation")
 
     def __init__(self):
         """
         Creates an object with different private data members and initializes all data members.
         """
-        # Creates an empty list that is used to store all positions on the board
-        self._board_pos = []
-        # Creates lists that stores the positions of the palace
-        self._palace_red = ["d1", "d2", "d3", "e1", "e2", "e3", "f1", "f2", "f3"]
-        self._palace_blue = ["d8", "d9", "d10", "e8", "e9", "e10", "f8", "f9", "f10"]
-        self._palace_all = self._palace_red + self._palace_blue
-        # Initializes the board
+        # Refers to the shared tuple of all square ids on the board
+        self._board_pos = BOARD_POS
+        # Refers to the shared lists of the square ids of the palace
+        self._palace_red = PALACE["red"]
+        self._palace_blue = PALACE["blue"]
+        self._palace_all = PALACE_ALL
+        # Initializes the board (a flat list of 90 slots indexed by the square id)
         self._board = self.start_board()
         # Initializes the game state to "UNFINISHED"
         self._game_state = "UNFINISHED"
         # Keeps track of whose turn and initializing it to the starting player "blue"
         self._whose_turn = "blue"
         # Initializes lists that are used to track general's remaining legal moves to the four position besides.
-        self._track_blue = ["d8", "d9", "e8", "e10", "f8", "f9"]
-        self._track_red = ["d2", "d3", "e1", "e3", "f2", "f3"]
+        self._track_blue = [SQUARE_INDEX[pos] for pos in ["d8", "d9", "e8", "e10", "f8", "f9"]]
+        self._track_red = [SQUARE_INDEX[pos] for pos in ["d2", "d3", "e1", "e3", "f2", "f3"]]
         # Initializes the player objects
-        self._blue = Blue()
-        self._red = Red()
+        self._blue = Player("blue")
+        self._red = Player("red")
+        # Initializes the undo stack of the moves made so far
+        self._history = []
+        # Initializes the list of the listeners that are told about the moves (silent by default)
+        self._listeners = []
+        # Initializes the Zobrist hash of the position (updated incrementally by every move)
+        self._hash = self.compute_hash()
+        # Initializes the score of the position from blue's view (material and piece-square values,
+        # updated incrementally by every move)
+        self._evaluation = self.compute_evaluation()
+        # The attack maps (only kept when asked for by build_attack_maps, then updated incrementally by every move):
+        # the attacked squares (bytes, or the shared step tables) and the bitmap of the squares they depend on
+        # of every piece on the board, and the number of pieces of every player that attack every square
+        self._attack_squares = None
+        self._attack_depends = None
+        self._attack_count = None
+        # The cache of the legal moves of the recently visited positions (created when it is first needed)
+        self._move_cache = None
 
     def get_board(self):
         """
-        Returns the board.
+        Returns the board as a dictionary, which stores the positions (ex. "b3" and "a10") as keys
+        and stores the piece objects on the positions as values.
         """
-        return self._board
+        return dict(zip(SQUARE_NAME, self._board))
 
     def get_game_state(self):
         """
         Returns one of these values, depending on the game state: "UNFINISHED" or "RED_WON" or "BLUE_WON".
+        The game state of a position set up without one is found from the board the first time it is asked for.
         """
+        if self._game_state is None:
+            self._game_state = self.find_game_state()
         return self._game_state
 
+    def find_game_state(self):
+        """
+        Returns the game state found from the board: the opponent has won when the player to move is checkmated,
+        otherwise "UNFINISHED".
+        """
+        # The checkers and the lines to the General are found once
+        context = self.check_lines(self._whose_turn)
+        if context[1] and not self.has_legal_move(self._whose_turn, context):
+            return "RED_WON" if self._whose_turn == "blue" else "BLUE_WON"
+        return "UNFINISHED"
+
     def get_whose_turn(self):
         """
         Returns the player whose turn.
@@ -54,6 +136,8 @@ class JanggiGame:
         """
         Sets the player whose turn to the next player.
         """
+        if player != self._whose_turn:
+            self._hash ^= ZOBRIST_RED_TURN
         self._whose_turn = player
 
     def get_palace_red(self):
@@ -76,7 +160,7 @@ class JanggiGame:
 
     def get_board_pos(self):
         """
-        Returns the list that is used to store all positions on the board.
+        Returns the tuple of all square ids on the board (shared by every game).
         """
         return self._board_pos
 
@@ -92,21 +176,168 @@ class JanggiGame:
         """
         return self._track_red
 
+    def position_hash(self):
+        """
+        Returns the 64-bit Zobrist hash of the current position (the pieces on the board and the side to move).
+        """
+        return self._hash
+
+    def compute_hash(self):
+        """
+        Computes the Zobrist hash of the current position from scratch.
+        """
+        position_hash = 0
+        for pos, piece in enumerate(self._board):
+            if piece is not None:
+                position_hash ^= ZOBRIST_PIECE[(piece.get_player(), piece.get_role())][pos]
+        if self._whose_turn == "red":
+            position_hash ^= ZOBRIST_RED_TURN
+        return position_hash
+
+    def evaluate(self, player):
+        """
+        Takes a parameter that represents the player.
+        Returns the static evaluation of the position from the view of that player: the material values and
+        piece-square bonuses of the player's pieces minus the opponent's, in hundredths of a material point
+        (ex. a Chariot is 1300). Kept up to date by every move, so it takes constant time.
+        """
+        if player == "red":
+            return -self._evaluation
+        return self._evaluation
+
+    def compute_evaluation(self):
+        """
+        Computes the evaluation of the current position from blue's view from scratch.
+        """
+        evaluation = 0
+        for pos, piece in enumerate(self._board):
+            if piece is not None:
+                evaluation += PIECE_SQUARE_BLUE[(piece.get_player(), piece.get_role())][pos]
+        return evaluation
+
     def is_in_check(self, player):
         """
         Takes as a parameter either "red" or "blue" and returns True if that player is in check,
-        but returns False otherwise.
+        but returns False otherwise. The answer is a lookup when the attack maps are kept (see build_attack_maps),
+        otherwise the opponent's pieces are asked whether they reach the General.
         """
-        # blue player
-        if player == "blue":
-            if self._blue.get_in_check() is True:
-                return True
-        # red player
-        if player == "red":
-            if self._red.get_in_check() is True:
-                return True
+        general_pos = self.get_general_pos(player)
+        if general_pos is None:
+            return False
+        opponent = "red" if player == "blue" else "blue"
+        if self._attack_count is not None:
+            return self._attack_count[COUNT_OFFSET[opponent] + general_pos] > 0
+        return self.is_attacked(general_pos, opponent)
+
+    def build_attack_maps(self):
+        """
+        Builds the attack maps of the current position from scratch. From then on they are kept up to date by every
+        move until drop_attack_maps is called, which makes is_in_check a lookup but every move slower, so they are
+        only worth it for callers that ask about the attacks many times per position.
+        """
+        self._attack_squares = [None] * (2 * len(PIECE_KEYS))
+        self._attack_depends = [0] * (2 * len(PIECE_KEYS))
+        self._attack_count = array("B", bytes(180))
+        for player_obj in (self._blue, self._red):
+            offset = PLAYER_OFFSET[player_obj.get_player()]
+            for slot in range(len(PIECE_KEYS)):
+                pos = player_obj.get_square(slot)
+                if pos is not None:
+                    self.add_attacks(self._board[pos], offset + slot)
+
+    def drop_attack_maps(self):
+        """
+        Frees the attack maps and stops keeping them up to date (they are built again by get_attack_map,
+        get_attackers or build_attack_maps).
+        """
+        self._attack_squares = None
+        self._attack_depends = None
+        self._attack_count = None
+
+    def add_attacks(self, piece, index):
+        """
+        Takes two parameters that represent the piece object on the board and its index in the attack maps (the
+        player's offset plus the piece's slot). Computes the squares it attacks and adds them to the attack maps.
+        """
+        attacks, depends = self.piece_attacks(piece)
+        # The step targets without dependencies are the shared tables and are kept as they are
+        if depends:
+            attacks = bytes(attacks)
+            depends_bits = 0
+            for pos in depends:
+                depends_bits |= SQUARE_BIT[pos]
+            self._attack_depends[index] = depends_bits
+        self._attack_squares[index] = attacks
+        count = self._attack_count
+        offset = COUNT_OFFSET[piece.get_player()]
+        for pos in attacks:
+            count[offset + pos] += 1
+
+    def remove_attacks(self, index):
+        """
+        Takes a parameter that represents the index of the piece in the attack maps (the player's offset plus the
+        piece's slot). Removes the squares it attacks from the attack maps (nothing when it is not in the maps).
+        """
+        attacks = self._attack_squares[index]
+        if attacks is not None:
+            count = self._attack_count
+            offset = COUNT_OFFSET["blue"] if index < PLAYER_OFFSET["red"] else COUNT_OFFSET["red"]
+            for pos in attacks:
+                count[offset + pos] -= 1
+            self._attack_squares[index] = None
+            self._attack_depends[index] = 0
+
+    def update_attacks(self, start_pos, end_pos, piece, captured, captured_slot):
+        """
+        Takes parameters that represent the two squares whose pieces changed, the moved piece (on the board),
+        the captured piece (or None) and its slot. Updates the attack maps after the move (or after taking it back):
+        the attacks of the two pieces and of the pieces whose lines or legs pass through the two squares are
+        computed again.
+        """
+        changed = SQUARE_BIT[start_pos] | SQUARE_BIT[end_pos]
+        affected = [index for index, depends_bits in enumerate(self._attack_depends) if depends_bits & changed]
+        player = piece.get_player()
+        index = PLAYER_OFFSET[player] + self.get_player_obj(player).get_slot(piece.get_position())
+        if index not in affected:
+            affected.append(index)
+        if captured is not None:
+            index = PLAYER_OFFSET[captured.get_player()] + captured_slot
+            if index not in affected:
+                affected.append(index)
+        for index in affected:
+            self.remove_attacks(index)
+            if index < PLAYER_OFFSET["red"]:
+                pos = self._blue.get_square(index - PLAYER_OFFSET["blue"])
+            else:
+                pos = self._red.get_square(index - PLAYER_OFFSET["red"])
+            # A captured piece has no position and is left out of the maps
+            if pos is not None:
+                self.add_attacks(self._board[pos], index)
 
-        return False
+    def get_attack_map(self, player):
+        """
+        Takes a parameter that represents the player.
+        Returns a new array (indexed by the square id) of the number of the player's pieces that attack every square.
+        """
+        if self._attack_count is None:
+            self.build_attack_maps()
+        offset = COUNT_OFFSET[player]
+        return self._attack_count[offset:offset + 90]
+
+    def get_attackers(self, pos, player):
+        """
+        Takes two parameters that represent the square id and the player.
+        Returns the list of the player's piece objects that attack the square.
+        """
+        if self._attack_squares is None:
+            self.build_attack_maps()
+        attackers = []
+        player_obj = self.get_player_obj(player)
+        for slot in range(len(PIECE_KEYS)):
+            attacks = self._attack_squares[PLAYER_OFFSET[player] + slot]
+            if attacks is not None and pos in attacks:
+                attackers.append(self._board[player_obj.get_square(slot)])
+        return attackers
 
     def make_move(self, start_pos, end_pos):
         """
@@ -117,920 +348,1203 @@ class JanggiGame:
         If the game has already been won.
         Otherwise it should make the indicated move, remove any captured piece, update the game state if necessary,
         update whose turn it is, and return True.
+        Passing the same square twice passes the turn (not allowed when the player whose turn it is is in check).
         """
-        # Track tests
-        print("Attempting: ", start_pos, "->", end_pos)
+        return self.play_move(start_pos, end_pos) is None
+
+    def play_move(self, start_pos, end_pos):
+        """
+        Takes two parameters (strings) that represent the square to move from and the square to move to.
+        Works like make_move, but returns None when the move is made, otherwise returns the reason why it is
+        rejected (see MoveListener.on_reject).
+        """
+        # Converts the algebraic notation to the square ids (None when it is not on the board)
+        start_square = SQUARE_INDEX.get(start_pos)
+        end_square = SQUARE_INDEX.get(end_pos)
+        if start_square is None or end_square is None:
+            if self._listeners:
+                self.notify("on_attempt", start_pos, end_pos)
+            return self.reject_move(start_pos, end_pos, "NOT_ON_BOARD")
+        return self.play_square_move(start_square, end_square)
+
+    def play_square_move(self, start_square, end_square):
+        """
+        Takes two parameters that represent the square ids to move from and to (the same square id passes the turn).
+        Works like play_move without parsing any notation (used by replays of packed records): returns None when
+        the move is made, otherwise the reason why it is rejected. The listeners still get the square names.
+        """
+        if not (0 <= start_square < 90 and 0 <= end_square < 90):
+            if self._listeners:
+                self.notify("on_attempt", str(start_square), str(end_square))
+            return self.reject_move(str(start_square), str(end_square), "NOT_ON_BOARD")
+        # The names are only looked up (never parsed), for the listeners and the rejections
+        start_pos = SQUARE_NAME[start_square]
+        end_pos = SQUARE_NAME[end_square]
+        # Tells the listeners (if any) about the attempt
+        if self._listeners:
+            self.notify("on_attempt", start_pos, end_pos)
 
         # Calls search_pos to find the piece object on it
-        piece = self.search_pos(start_pos)
+        piece = self.search_pos(start_square)
         # Check whether there is a piece on the starting position
         if piece is None:
-            return False
+            return self.reject_move(start_pos, end_pos, "NO_PIECE")
+        # Checks the game current status (Cannot move or pass after the game completed)
+        if self.get_game_state() == "RED_WON" or self.get_game_state() == "BLUE_WON":
+            return self.reject_move(start_pos, end_pos, "GAME_OVER")
 
         # Pass a turn
-        if start_pos == end_pos:
-            # Cannot pass when being in check
-            if piece.get_player() == "blue":
-                if self._blue.get_in_check() is True:
-                    return False
-            else:
-                if self._red.get_in_check() is True:
-                    return False
+        if start_square == end_square:
+            # The player whose turn it is cannot pass when being in check
+            if self.is_in_check(self.get_whose_turn()) is True:
+                return self.reject_move(start_pos, end_pos, "IN_CHECK")
             # Update whose turn it is
-            if self.get_whose_turn() == "red":
-                self.set_whose_turn("blue")
-            else:
-                self.set_whose_turn("red")
-            return True
+            self.push_move(start_square, end_square)
+            if self._listeners:
+                self.notify("on_accept", start_pos, end_pos)
+            return None
 
         # If the square being moved from does not contain a piece belonging to the player whose turn it is
         if piece.get_player() != self.get_whose_turn():
-            return False
+            return self.reject_move(start_pos, end_pos, "NOT_YOUR_TURN")
         # Calls move method to check the move is whether valid
-        if self.valid_move(piece, end_pos) is False:
-            return False
-        # Checks the game current status (Cannot move after the game completed)
-        if self.get_game_state() == "RED_WON" or self.get_game_state() == "BLUE_WON":
-            return False
-
-        # Removes any captured piece
-        if self.search_pos(end_pos) is not None:
-            # Remove from the player's remaining piece list
-            # blue player
-            if self.search_pos(end_pos).get_player() == "blue":
-                self._blue.remove_piece(self.search_pos(end_pos))
-            # red player
-            else:
-                self._red.remove_piece(self.search_pos(end_pos))
-            # Update removed piece object's position to None
-            self.search_pos(end_pos).set_position(None)
+        if self.valid_move(piece, end_square) is False:
+            return self.reject_move(start_pos, end_pos, "ILLEGAL_MOVE")
 
-        # Update the Board
-        self.clear_board(piece)
-
-        # Update remain lists (move to the new position)
-        if piece.get_player() == "blue":
-            self._blue.update_position(piece, end_pos)
-        else:
-            self._red.update_position(piece, end_pos)
-
-        # Update piece object & Board
-        piece.set_position(end_pos)
-        self.move_board(piece, end_pos)
-
-        # Track General's position
-        if piece.get_role() == "General":
-            self.track_general(piece)
-
-        # After the valid move is completed, call the next move method to check whether the general is in check
-        if self.next_move(piece) is True:
+        # The move cannot leave the own general in check (found without making the move)
+        player_own = piece.get_player()
+        if self.is_legal_move(piece, end_square) is False:
+            return self.reject_move(start_pos, end_pos, "GENERAL_IN_CHECK")
+
+        # Makes the move (removes any captured piece and updates whose turn it is)
+        self.push_move(start_square, end_square)
+        opponent = "red" if player_own == "blue" else "blue"
+        if self._listeners:
+            self.notify("on_accept", start_pos, end_pos)
+
+        # After the valid move is completed, check whether the opponent's general is in check
+        if self.is_in_check(opponent) is True:
+            if self._listeners:
+                self.notify("on_check", opponent)
             # Call checkmate method to check whether it is checkmate
-            if self.checkmate(piece) is True:
-                return True
-
-        # Checks the in check status
-        if piece.get_player() == "blue":
-            # Check after moving if the general is still being in check
-            # Find red player's pieces
-            for role, pos in list(self._red.get_remain_piece().items()):
-                piece_obj = self.search_pos(pos)
-                # If yes, reverse the move and return False
-                if self.next_move(piece_obj) is True:
-                    # Restore the remain list:
-                    self._blue.update_position(piece, start_pos)
-                    # Restore the board and piece object
-                    self.clear_board(piece)
-                    piece.set_position(start_pos)
-                    self.move_board(piece, start_pos)
-                    # Restore the removed piece and add back to the lists
-                    if self.search_pos(end_pos) is not None:
-                        self.search_pos(end_pos).set_position(end_pos)
-                        self._red.restore_removed(self.search_pos(end_pos), end_pos)
-                    # Track back General's position
-                    if piece.get_role() == "General":
-                        self.track_general(piece)
-                    return False
-                # If not, change the status since it is not in check now
-                self._blue.set_in_check(False)
-
-        if piece.get_player() == "red":
-            # Check after moving if the general is still being in check
-            # Find blue player's pieces
-            for role, pos in list(self._blue.get_remain_piece().items()):
-                piece_obj = self.search_pos(pos)
-                # If yes, reverse the move and return False
-                if self.next_move(piece_obj) is True:
-                    # Restore the remain list:
-                    self._red.update_position(piece, start_pos)
-                    # Restore the board and piece object
-                    self.clear_board(piece)
-                    piece.set_position(start_pos)
-                    self.move_board(piece, start_pos)
-                    # Restore the removed piece and add back to the lists
-                    if self.search_pos(end_pos) is not None:
-                        self.search_pos(end_pos).set_position(end_pos)
-                        self._blue.restore_removed(self.search_pos(end_pos), end_pos)
-                    # Track back General's position
-                    if piece.get_role() == "General":
-                        self.track_general(piece)
-                    return False
-                # If not, change the status since it is not in check now
-                self._red.set_in_check(False)
+            if self.checkmate(piece) is True and self._listeners:
+                self.notify("on_game_end", self._game_state)
+
+        return None
+
+    def reject_move(self, start_pos, end_pos, reason):
+        """
+        Takes three parameters that represent the squares (strings) of the rejected move and the reason.
+        Tells the listeners (if any) about the rejection and returns the reason.
+        """
+        if self._listeners:
+            self.notify("on_reject", start_pos, end_pos, reason)
+        return reason
+
+    def replay(self, moves, index=0):
+        """
+        Takes a parameter that represents the moves, which can be any iterable (read lazily) of (start, end) pairs
+        of strings or a string of moves (ex. "c7c6 c1d3" or "c7-c6,c1-d3"), and an optional index of the game.
+        Makes the moves one by one and stops at the first move that is rejected.
+        Returns a ReplayResult object.
+        """
+        if isinstance(moves, str):
+            moves = parse_moves(moves)
+        ply = 0
+        for move in moves:
+            if move is None or len(move) != 2:
+                return ReplayResult(index, ply, "BAD_FORMAT", move, self.get_game_state())
+            reason = self.play_move(move[0], move[1])
+            if reason is not None:
+                return ReplayResult(index, ply, reason, move, self.get_game_state())
+            ply += 1
+        return ReplayResult(index, ply, None, None, self.get_game_state())
+
+    def add_listener(self, listener):
+        """
+        Takes a parameter that represents a MoveListener object, which is told about the moves from now on.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Takes a parameter that represents a MoveListener object, which is not told about the moves any more.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def notify(self, event, *args):
+        """
+        Takes the name of the event (ex. "on_accept") and its arguments.
+        Calls that method of every listener with the game and the arguments.
+        """
+        for listener in self._listeners:
+            getattr(listener, event)(self, *args)
+
+    def push_move(self, start_pos, end_pos):
+        """
+        Takes two parameters that represent the square ids to move from and to (the same square id passes the turn).
+        Makes the move without checking it, removes any captured piece, updates whose turn it is,
+        and pushes a MoveRecord onto the undo stack. Returns the MoveRecord.
+        """
+        piece = self._board[start_pos]
+        captured = None
+        captured_slot = None
+        if start_pos != end_pos:
+            captured = self._board[end_pos]
+        # Removes any captured piece from the player's remaining piece list
+        if captured is not None:
+            captured_slot = self.get_player_obj(captured.get_player()).remove_piece(captured)
+            captured.set_position(None)
+        record = MoveRecord(piece, start_pos, end_pos, captured, captured_slot, self._whose_turn, self._game_state,
+                            self._track_blue, self._track_red, self._hash)
+
+        # Update the hash (the side to move always changes)
+        self._hash ^= ZOBRIST_RED_TURN
+        if start_pos != end_pos:
+            piece_key = ZOBRIST_PIECE[(piece.get_player(), piece.get_role())]
+            self._hash ^= piece_key[start_pos] ^ piece_key[end_pos]
+            # Update the evaluation the same way
+            piece_value = PIECE_SQUARE_BLUE[(piece.get_player(), piece.get_role())]
+            self._evaluation += piece_value[end_pos] - piece_value[start_pos]
+            if captured is not None:
+                self._hash ^= ZOBRIST_PIECE[(captured.get_player(), captured.get_role())][end_pos]
+                self._evaluation -= PIECE_SQUARE_BLUE[(captured.get_player(), captured.get_role())][end_pos]
+
+        if start_pos != end_pos:
+            # Update remain lists, piece object & Board
+            self.get_player_obj(piece.get_player()).update_position(piece, end_pos)
+            self._board[start_pos] = None
+            self._board[end_pos] = piece
+            piece.set_position(end_pos)
+            # Track General's position
+            if piece.get_role() == "General":
+                self.track_general(piece)
+            if self._attack_squares is not None:
+                self.update_attacks(start_pos, end_pos, piece, captured, captured_slot)
 
         # Update whose turn it is
-        if self.get_whose_turn() == "red":
-            self.set_whose_turn("blue")
+        if self._whose_turn == "red":
+            self._whose_turn = "blue"
         else:
-            self.set_whose_turn("red")
+            self._whose_turn = "red"
+        self._history.append(record)
+        return record
+
+    def pop_move(self):
+        """
+        Takes back the last move pushed by push_move and restores the board, the remaining piece lists,
+        General tracking, the game state and whose turn it is.
+        Returns the MoveRecord, or None when there is no move to take back.
+        """
+        if len(self._history) == 0:
+            return None
+        record = self._history.pop()
+        start_pos = record.get_start_pos()
+        end_pos = record.get_end_pos()
+
+        if start_pos != end_pos:
+            piece = record.get_piece()
+            captured = record.get_captured()
+            # Restore the remain list, the board and piece object
+            self.get_player_obj(piece.get_player()).update_position(piece, start_pos)
+            piece.set_position(start_pos)
+            self._board[start_pos] = piece
+            self._board[end_pos] = captured
+            # Restore the removed piece and add back to the lists
+            if captured is not None:
+                captured.set_position(end_pos)
+                self.get_player_obj(captured.get_player()).restore_removed(record.get_captured_slot(), end_pos)
+                self._evaluation += PIECE_SQUARE_BLUE[(captured.get_player(), captured.get_role())][end_pos]
+            piece_value = PIECE_SQUARE_BLUE[(piece.get_player(), piece.get_role())]
+            self._evaluation -= piece_value[end_pos] - piece_value[start_pos]
+            if self._attack_squares is not None:
+                self.update_attacks(start_pos, end_pos, piece, captured, record.get_captured_slot())
+
+        # Track back General's position, the game state and whose turn
+        self._track_blue, self._track_red = record.get_track()
+        self._game_state = record.get_game_state()
+        self._whose_turn = record.get_whose_turn()
+        self._hash = record.get_hash()
+        return record
+
+    def get_history(self):
+        """
+        Returns the undo stack (the list of MoveRecord objects of the moves made so far).
+        """
+        return self._history
+
+    def memory_report(self):
+        """
+        Returns a dictionary of the memory used by this game's own objects in bytes: the game object, the board,
+        the pieces (including the captured ones), the players, the undo stack, the attack maps and the total.
+        The tables shared by every game (the move tables, the palaces and the square ids) are not counted.
+        """
+        pieces = [piece for piece in self._board if piece is not None]
+        pieces += [record.get_captured() for record in self._history if record.get_captured() is not None]
+        report = {"game": sys.getsizeof(self),
+                  "board": sys.getsizeof(self._board),
+                  "pieces": sum(sys.getsizeof(piece) for piece in pieces),
+                  "players": self._blue.get_size_bytes() + self._red.get_size_bytes(),
+                  "tracks": sys.getsizeof(self._track_blue) + sys.getsizeof(self._track_red),
+                  "history": sys.getsizeof(self._history) + sum(sys.getsizeof(record) for record in self._history),
+                  "attacks": 0,
+                  "move_cache": 0 if self._move_cache is None else self._move_cache.get_size_bytes(),
+                  "other": sys.getsizeof(self._listeners) + sys.getsizeof(self._hash) +
+                  sys.getsizeof(self._evaluation)}
+        if self._attack_squares is not None:
+            report["attacks"] = (sys.getsizeof(self._attack_squares) + sys.getsizeof(self._attack_depends) +
+                                 sys.getsizeof(self._attack_count))
+            for attacks, depends_bits in zip(self._attack_squares, self._attack_depends):
+                # The step targets without dependencies are the shared tables
+                if depends_bits:
+                    report["attacks"] += sys.getsizeof(attacks) + sys.getsizeof(depends_bits)
+        report["total"] = sum(report.values())
+        return report
+
+    def clone(self):
+        """
+        Returns a new JanggiGame object with the same position, which can be played without changing this game.
+        The tables are shared, the board is copied in one pass and the piece arrays are copied flat.
+        The clone starts with an empty undo stack and no listeners.
+        """
+        game = self.__class__.__new__(self.__class__)
+        game._board_pos = self._board_pos
+        game._palace_red = self._palace_red
+        game._palace_blue = self._palace_blue
+        game._palace_all = self._palace_all
+        game._board = [None if piece is None else piece.copy() for piece in self._board]
+        game._game_state = self._game_state
+        game._whose_turn = self._whose_turn
+        # The track lists are replaced (never changed in place) by track_general, so they can be shared
+        game._track_blue = self._track_blue
+        game._track_red = self._track_red
+        game._blue = self._blue.copy()
+        game._red = self._red.copy()
+        game._history = []
+        game._listeners = []
+        game._hash = self._hash
+        game._evaluation = self._evaluation
+        game._attack_squares = None
+        game._attack_depends = None
+        game._attack_count = None
+        game._move_cache = None
+        return game
+
+    def snapshot(self):
+        """
+        Returns a read-only GameSnapshot of the current position, which does not change when this game goes on.
+        """
+        layout = tuple(None if piece is None else (piece.get_player(), piece.get_role()) for piece in self._board)
+        return GameSnapshot(layout, self._whose_turn, self.get_game_state(),
+                            (self.is_in_check("blue"), self.is_in_check("red")),
+                            (tuple(self._track_blue), tuple(self._track_red)), self._hash)
+
+    def load_snapshot(self, snapshot):
+        """
+        Takes a parameter that represents a GameSnapshot object.
+        Sets up the game exactly as it was when the snapshot was taken (the undo stack is emptied).
+        """
+        self.set_position(snapshot.get_layout(), snapshot.get_whose_turn(), snapshot.get_game_state())
+        self._track_blue = list(snapshot.get_track()[0])
+        self._track_red = list(snapshot.get_track()[1])
+
+    def set_position(self, layout, whose_turn="blue", game_state=None):
+        """
+        Takes parameters that represent the layout (a sequence of 90 entries indexed by the square id, which are
+        None or (player, role) pairs), the player to move and the game state (found from the board by
+        get_game_state when it is not given: the opponent has won when the player to move is checkmated,
+        otherwise "UNFINISHED").
+        Sets up the game at that position: the pieces, the remaining piece arrays, General tracking, the hash and
+        the evaluation. The undo stack is emptied.
+        Raises ValueError when the layout does not have 90 squares or a player has too many pieces of a role.
+        """
+        if len(layout) != 90:
+            raise ValueError("The layout must have 90 squares.")
+        board = [None] * 90
+        players = {"blue": Player("blue", CAPTURED_SQUARES), "red": Player("red", CAPTURED_SQUARES)}
+        # The hash and the evaluation are computed while placing the pieces
+        position_hash = ZOBRIST_RED_TURN if whose_turn == "red" else 0
+        evaluation = 0
+        for pos, entry in enumerate(layout):
+            if entry is not None:
+                player, role = entry
+                piece_class, piece_hash, piece_value = PIECE_SETUP[entry]
+                players[player].add_piece(role, pos)
+                board[pos] = piece_class(player, pos)
+                position_hash ^= piece_hash[pos]
+                evaluation += piece_value[pos]
+        self._board = board
+        self._blue = players["blue"]
+        self._red = players["red"]
+        self._whose_turn = whose_turn
+        self._game_state = game_state
+        self._history = []
+        self._track_blue = []
+        self._track_red = []
+        for player in ("blue", "red"):
+            general_pos = self.get_general_pos(player)
+            if general_pos is not None:
+                self.track_general(board[general_pos])
+        self._hash = position_hash
+        self._evaluation = evaluation
+        self._attack_squares = None
+        self._attack_depends = None
+        self._attack_count = None
+
+    def to_notation(self):
+        """
+        Returns the position as a FEN-style string: the ranks from 1 (red's side) to 10 separated by "/",
+        where a letter is a piece (upper case blue, lower case red: K General, A Guard, B Elephant, N Horse,
+        R Chariot, C Cannon, P Soldier) and a digit counts the empty squares, then the side to move
+        ("w" blue, "b" red). Ex. the opening is "rbna1abnr/4k4/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/4K4/RBNA1ABNR w".
+        """
+        ranks = []
+        board = self._board
+        for start in range(0, 90, 9):
+            rank = ""
+            empty = 0
+            for piece in board[start:start + 9]:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += PIECE_LETTER[(piece.get_player(), piece.get_role())]
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        return "/".join(ranks) + " " + TURN_LETTER[self._whose_turn]
 
-        return True
+    def from_notation(self, notation):
+        """
+        Takes a parameter that represents a position string made by to_notation (more fields after the side to
+        move are ignored, and the side to move defaults to blue).
+        Sets up the game at that position with set_position (a checkmated position is a won game).
+        Raises ValueError when the string is not valid.
+        """
+        layout, whose_turn = parse_notation(notation)
+        self.set_position(layout, whose_turn)
 
     def search_pos(self, pos):
         """
-        Takes a parameter (strings) that represents the square and returns the piece object on it.
+        Takes a parameter that represents the square id and returns the piece object on it.
         """
-        for square in self.get_board():
-            if pos == square:
-                return self.get_board()[pos]
+        return self._board[pos]
 
     def start_board(self):
         """
-        Add all positions on the board to the board_pos list.
-        To initializes the board, implementing a dictionary, which stores the positions (ex. "b3" and "a10") as keys
-        and stores the piece objects on the positions as values.
+        To initializes the board, implementing a list of 90 slots, which is indexed by the square id
+        and stores the piece objects on the squares as values.
         """
-        column_label = ["a", "b", "c", "d", "e", "f", "g", "h", "i"]
-        row_label = [str(num) for num in range(1, 11)]
         # Sets red's pieces
-        role_red = [Chariot("red", "a1"), Elephant("red", "b1"), Horse("red", "c1"), Guard("red", "d1"),
-                    General("red", "e2"), Guard("red", "f1"), Elephant("red", "g1"), Horse("red", "h1"),
-                    Chariot("red", "i1"), Cannon("red", "b3"), Cannon("red", "h3"), Soldier("red", "a4"),
-                    Soldier("red", "c4"), Soldier("red", "e4"), Soldier("red", "g4"), Soldier("red", "i4")]
+        role_red = [(Chariot, "a1"), (Elephant, "b1"), (Horse, "c1"), (Guard, "d1"), (General, "e2"), (Guard, "f1"),
+                    (Elephant, "g1"), (Horse, "h1"), (Chariot, "i1"), (Cannon, "b3"), (Cannon, "h3"),
+                    (Soldier, "a4"), (Soldier, "c4"), (Soldier, "e4"), (Soldier, "g4"), (Soldier, "i4")]
         # Sets blue's pieces
-        role_blue = [Chariot("blue", "a10"), Elephant("blue", "b10"), Horse("blue", "c10"), Guard("blue", "d10"),
-                     General("blue", "e9"), Guard("blue", "f10"), Elephant("blue", "g10"), Horse("blue", "h10"),
-                     Chariot("blue", "i10"), Cannon("blue", "b8"), Cannon("blue", "h8"), Soldier("blue", "a7"),
-                     Soldier("blue", "c7"), Soldier("blue", "e7"), Soldier("blue", "g7"), Soldier("blue", "i7")]
-        role_all = role_red + role_blue
-        board = {}
-        # Creates a list that stores all the positions of the board.
-        for column in column_label:
-            for row in row_label:
-                self._board_pos.append(column + row)
-
+        role_blue = [(Chariot, "a10"), (Elephant, "b10"), (Horse, "c10"), (Guard, "d10"), (General, "e9"),
+                     (Guard, "f10"), (Elephant, "g10"), (Horse, "h10"), (Chariot, "i10"), (Cannon, "b8"),
+                     (Cannon, "h8"), (Soldier, "a7"), (Soldier, "c7"), (Soldier, "e7"), (Soldier, "g7"),
+                     (Soldier, "i7")]
         # Initialize the board with None values
-        for position in self._board_pos:
-            board[position] = None
+        board = [None] * 90
 
         # Add the pieces to the board with their first position
-        for square in board:
-            for role in role_all:
-                position = role.get_position()
-                if square == position:
-                    board[square] = role
+        for player, role_all in (("red", role_red), ("blue", role_blue)):
+            for role, position in role_all:
+                board[SQUARE_INDEX[position]] = role(player, SQUARE_INDEX[position])
 
         # Finish initializing
         return board
 
     def checkmate(self, piece):
         """
-        Takes a parameter that represents the piece object.
-        Return True when checkmate and update the game status to end the game. Return False, otherwise.
+        Takes a parameter that represents the piece object that made the checking move.
+        Return True when checkmate (the opponent has no legal move that leaves its General safe)
+        and update the game status to end the game. Return False, otherwise.
         """
-        escape_lst_red = []
-        escape_lst_blue = []
         owner = piece.get_player()
-
+        opponent = "red" if owner == "blue" else "blue"
+        # Stops at the first legal move of the opponent
+        if self.has_legal_move(opponent):
+            return False
         if owner == "blue":
-            general_pos = self.get_general_pos("red")
-            general = self.search_pos(general_pos)
-
-            # Check the general's next step can whether escapes from in check
-            for move in self.get_track_red():
-                if self.valid_move(piece, move) is False:
-                    escape_lst_red.append(move)
-
-            last_valid_red = []
-            for move in escape_lst_red:
-                if self.valid_move(general, move) is True:
-                    last_valid_red.append(move)
-
-            # Remove the general from the current position (on Board)
-            self.clear_board(general)
-
-            left_move_red = []
-            # Should also scan all remaining pieces of the blue player
-            for move in last_valid_red:
-                for role, pos in list(self._blue.get_remain_piece().items()):
-                    piece_obj = self.search_pos(pos)
-                    if self.valid_move(piece_obj, move) is True:
-                        left_move_red.append(move)
-
-            # Add back general's position
-            self.move_board(general, general_pos)
-
-            left_char_red = []
-            # Check whether red player's other pieces can help
-            for role, pos in list(self._red.get_remain_piece().items()):
-                piece_obj = self.search_pos(pos)
-                if piece_obj.get_role() == "General":
-                    continue
-                left_char_red.append(piece_obj)
-
-            for red_char in left_char_red:
-                for position in self.get_board_pos():
-                    if self.valid_move(red_char, position) is True and self.next_move(piece) is False:
-                        return False
-                    # Piece captured
-                    if self.valid_move(red_char, piece.get_position()) is True:
-                        return False
-
-            # Compare two lists
-            remain_route = set(last_valid_red) - set(left_move_red)
-
-            # After scanning all escape route
-            if len(remain_route) != 0:
-                return False
-            # No place to escape
-            else:
-                self._game_state = "BLUE_WON"
-                return True
-
-        if owner == "red":
-            general_pos = self.get_general_pos("blue")
-            general = self.search_pos(general_pos)
-
-            # Check the general's next step can whether escapes from in check
-            for move in self.get_track_blue():
-                if self.valid_move(piece, move) is False:
-                    escape_lst_blue.append(move)
-
-            last_valid_blue = []
-            for move in escape_lst_blue:
-                if self.valid_move(general, move) is True:
-                    last_valid_blue.append(move)
-
-            # Remove the general from the current position (on Board)
-            self.clear_board(general)
-
-            left_move_blue = []
-            # Should also scan all remaining pieces of the red player
-            for move in last_valid_blue:
-                for role, pos in list(self._red.get_remain_piece().items()):
-                    piece_obj = self.search_pos(pos)
-                    if self.valid_move(piece_obj, move) is True:
-                        left_move_blue.append(move)
-
-            # Add back general's position
-            self.move_board(general, general_pos)
-
-            # Check whether blue player's other pieces can help
-            left_char_blue = []
-            for role, pos in list(self._blue.get_remain_piece().items()):
-                piece_obj = self.search_pos(pos)
-                if piece_obj.get_role() == "General":
-                    continue
-                left_char_blue.append(piece_obj)
-
-            for blue_char in left_char_blue:
-                for position in self.get_board_pos():
-                    if self.valid_move(blue_char, position) is True and self.next_move(piece) is False:
-                        return False
-                    # Piece captured
-                    if self.valid_move(blue_char, piece.get_position()) is True:
-                        return False
-
-            # Compare two lists
-            remain_route = set(last_valid_blue) - set(left_move_blue)
+            self._game_state = "BLUE_WON"
+        else:
+            self._game_state = "RED_WON"
+        return True
 
-            # After scanning all escape route
-            if len(remain_route) != 0:
-                return False
-            # No place to escape
-            else:
-                self._game_state = "RED_WON"
+    def has_legal_move(self, player, context=None):
+        """
+        Takes a parameter that represents the player and an optional check_lines of the player (found when it is
+        not given). Returns True as soon as one move of the player is found that leaves its General safe,
+        otherwise False.
+        """
+        if self._move_cache is not None:
+            entry = self._move_cache.lookup(self._hash, player)
+            if entry is not None:
+                return len(entry[0]) > 0
+        if context is None:
+            context = self.check_lines(player)
+        for its_pos in self.get_player_obj(player).get_positions():
+            for end_pos in self.legal_targets(self._board[its_pos], context):
                 return True
+        return False
 
     def track_general(self, piece):
         """
         Takes a parameter that represents the piece object.
         Track General's valid moves by modifying the list that stores the valid moves of each general.
         """
-        if piece.get_player() == "blue":
-            self._track_blue = []
-            for move in self.get_palace_blue():
-                if self.valid_move(piece, move) is True:
-                    self._track_blue.append(move)
+        # The General's steps stay in the palace, so a palace square is a valid move when the General steps to it
+        # and it does not hold an own piece
+        player_own = piece.get_player()
+        steps = STEP_TABLE[("General", player_own)][piece.get_position()]
+        board = self._board
+        track = [move for move in (self.get_palace_blue() if player_own == "blue" else self.get_palace_red())
+                 if move in steps and (board[move] is None or board[move].get_player() != player_own)]
+        if player_own == "blue":
+            self._track_blue = track
         else:
-            self._track_red = []
-            for move in self.get_palace_red():
-                if self.valid_move(piece, move) is True:
-                    self._track_red.append(move)
-        return
+            self._track_red = track
 
     def get_general_pos(self, player):
         """
         Takes Takes a parameter that represents the player.
         Return that player's general position.
         """
-        general_pos = None
         if player == "blue":
-            for role in self._blue.get_remain_piece():
-                if role == "General":
-                    general_pos = self._blue.get_remain_piece()[role]
-        else:
-            for role in self._red.get_remain_piece():
-                if role == "General":
-                    general_pos = self._red.get_remain_piece()[role]
-        return general_pos
-
-    def clear_board(self, piece):
-        """
-        Takes a parameter that represents the piece object.
-        Clears out the original place of the piece on board.
-        """
-        for square in self._board:
-            # Clears out the piece's original place
-            if square == piece.get_position():
-                self._board[square] = None
-                return
-
-    def move_board(self, piece, pos):
-        """
-        Takes two parameters that represent the square and the piece object.
-        Updates the piece's position on the board.
-        """
-        for square in self._board:
-            # Moves the piece object to the new square
-            if square == pos:
-                self._board[square] = piece
-                return
-
-    def next_move(self, piece):
-        """
-        Take the piece object as the parameter.
-        Return True when the next move to the opponent's general's position is valid.
-        """
-        player_own = piece.get_player()
-
-        # If the piece belongs to the red player
-        if player_own == "red":
-            # Find general's position
-            general_pos = self.get_general_pos("blue")
-            # Call valid move method to check
-            if self.valid_move(piece, general_pos) is True:
-                # Update in check
-                self._blue.set_in_check(True)
-                return True
-            # Also, check other pieces of red can whether capture blue's general
-            for role, pos in list(self._red.get_remain_piece().items()):
-                piece_obj = self.search_pos(pos)
-                if self.valid_move(piece_obj, general_pos) is True:
-                    # Update in check
-                    self._blue.set_in_check(True)
-                    return True
-            return False
-
-        # If the piece belongs to the blue player
-        if player_own == "blue":
-            # Find general's position
-            general_pos = self.get_general_pos("red")
-            # Call valid move method to check
-            if self.valid_move(piece, general_pos) is True:
-                # Update in check
-                self._red.set_in_check(True)
-                return True
-            # Also, check other pieces of blue can whether capture red's general
-            for role, pos in list(self._blue.get_remain_piece().items()):
-                piece_obj = self.search_pos(pos)
-                if self.valid_move(piece_obj, general_pos) is True:
-                    # Update in check
-                    self._red.set_in_check(True)
-                    return True
-            return False
+            return self._blue.get_square(GENERAL_SLOT)
+        return self._red.get_square(GENERAL_SLOT)
 
     def valid_move(self, piece, end_pos):
         """
-        Takes two parameters that represent the piece object and its target square.
-        According to its role:
+        Takes two parameters that represent the piece object and its target square id.
+        According to its role (the candidate squares are looked up from the precomputed move tables):
         If the move is invalid, then return False.
         Otherwise, return True.
         """
+        # Checks whether the target square is on the board
+        if end_pos is None:
+            return False
+
         # Gets the piece's role
         piece_role = piece.get_role()
+        # Gets the current square
+        its_pos = piece.get_position()
+        # Gets the owner
+        player_own = piece.get_player()
 
-        if piece_role == "General":
-            # Special case list
-            invalid_move = ["d2", "e1", "e3", "f2", "d9", "e8", "e10", "f9"]
-            # Gets the current square
-            its_pos = piece.get_position()
-            # Checks this piece belongs to which player
-            player_own = piece.get_player()
-            # Gets its palace
-            if player_own == "red":
-                palace = self.get_palace_red()
-            else:
-                palace = self.get_palace_blue()
-            # Checks whether the target square is in the palace
-            if end_pos not in palace:
+        # Checks the target square is whether occupied
+        pos_object = self._board[end_pos]
+        if pos_object is not None:
+            # If occupied, then checks this piece belongs to which player
+            if player_own == pos_object.get_player():
+                # If these two pieces belong to the same player, return False
                 return False
 
-            # Checks the target square is whether occupied
-            pos_object = self.search_pos(end_pos)
-            if pos_object is not None:
-                # If occupied, then checks this piece belongs to which player
-                if player_own == pos_object.get_player():
-                    # If these two pieces belong to the same player, return False
-                    return False
+        # General, Guard and Soldier cannot be blocked
+        if piece_role == "General" or piece_role == "Guard" or piece_role == "Soldier":
+            return end_pos in STEP_TABLE[(piece_role, player_own)][its_pos]
 
-            # Checks whether the move is valid
-            if abs(int(end_pos[1:]) - int(its_pos[1:])) > 1:
-                return False
-                # Checks alphabet
-            if abs(ord(end_pos[0]) - ord(its_pos[0])) > 1:
-                return False
-            # Special Case
-            if (its_pos in invalid_move) and (end_pos in invalid_move):
-                return False
-            return True
+        if piece_role == "Horse":
+            for leg, target in HORSE_MOVE[its_pos]:
+                if target == end_pos:
+                    # Check whether the leg is occupied (block)
+                    return self._board[leg] is None
+            return False
 
-        if piece_role == "Guard":
-            # Special case list
-            invalid_move = ["d2", "e1", "e3", "f2", "d9", "e8", "e10", "f9"]
-            # Gets the current square
-            its_pos = piece.get_position()
-            # Checks this piece belongs to which player
-            player_own = piece.get_player()
-            # Gets its palace
-            if player_own == "red":
-                palace = self.get_palace_red()
-            else:
-                palace = self.get_palace_blue()
-            # Checks whether the target square is in the palace
-            if end_pos not in palace:
-                return False
+        if piece_role == "Elephant":
+            for (first_leg, second_leg), target in ELEPHANT_MOVE[its_pos]:
+                if target == end_pos:
+                    # Check whether the route is occupied (block)
+                    return self._board[first_leg] is None and self._board[second_leg] is None
+            return False
+
+        # Gets the squares between them (including the palace's diagonal lines)
+        route = LINE_BETWEEN[its_pos][end_pos]
+        # Not moving along a line
+        if route is None:
+            return False
 
-            # Checks the target square is whether occupied
-            pos_object = self.search_pos(end_pos)
-            if pos_object is not None:
-                # If occupied, then checks this piece belongs to which player
-                if player_own == pos_object.get_player():
-                    # If these two pieces belong to the same player, return False
+        if piece_role == "Chariot":
+            # Check whether there is a piece between the route
+            for pos in route:
+                if self._board[pos] is not None:
                     return False
+            return True
 
-            # Checks whether the move is valid
-            if abs(int(end_pos[1:]) - int(its_pos[1:])) > 1:
-                return False
-            # Checks alphabet
-            if abs(ord(end_pos[0]) - ord(its_pos[0])) > 1:
+        if piece_role == "Cannon":
+            # The target square cannot be another Cannon
+            if pos_object is not None and pos_object.get_role() == "Cannon":
                 return False
-            # Special Case
-            if (its_pos in invalid_move) and (end_pos in invalid_move):
+            screen = None
+            for pos in route:
+                if self._board[pos] is not None:
+                    # Between two squares can only exist one element
+                    if screen is not None:
+                        return False
+                    screen = self._board[pos]
+            # Cannot cross another Cannon
+            if screen is None or screen.get_role() == "Cannon":
                 return False
             return True
+        return False
 
+    def get_player_obj(self, player):
+        """
+        Takes a parameter that represents the player ("blue" or "red").
+        Returns that player's object.
+        """
+        if player == "blue":
+            return self._blue
+        return self._red
+
+    def piece_attacks(self, piece):
+        """
+        Takes a parameter that represents the piece object.
+        Returns two lists: the square ids the piece attacks (the squares it could move to if they held an enemy
+        piece, so the squares of its own pieces are included), and the square ids whose pieces can change them
+        (the legs of the Horse and the Elephant, and the squares looked at along the lines).
+        """
+        board = self._board
+        piece_role = piece.get_role()
+        its_pos = piece.get_position()
+        if piece_role == "General" or piece_role == "Guard" or piece_role == "Soldier":
+            return STEP_TABLE[(piece_role, piece.get_player())][its_pos], ()
+        attacks = []
+        depends = []
         if piece_role == "Horse":
-            # Gets the current square
-            its_pos = piece.get_position()
-            # Gets the owner
-            player_own = piece.get_player()
+            for leg, target in HORSE_MOVE[its_pos]:
+                depends.append(leg)
+                if board[leg] is None:
+                    attacks.append(target)
+        elif piece_role == "Elephant":
+            for (first_leg, second_leg), target in ELEPHANT_MOVE[its_pos]:
+                depends.append(first_leg)
+                depends.append(second_leg)
+                if board[first_leg] is None and board[second_leg] is None:
+                    attacks.append(target)
+        elif piece_role == "Chariot":
+            for ray in ORTHOGONAL_RAY[its_pos] + PALACE_RAY[its_pos]:
+                for end_pos in ray:
+                    attacks.append(end_pos)
+                    depends.append(end_pos)
+                    if board[end_pos] is not None:
+                        break
+        else:
+            for ray in ORTHOGONAL_RAY[its_pos] + PALACE_RAY[its_pos]:
+                index = 0
+                while index < len(ray) and board[ray[index]] is None:
+                    depends.append(ray[index])
+                    index += 1
+                if index == len(ray):
+                    continue
+                depends.append(ray[index])
+                if board[ray[index]].get_role() == "Cannon":
+                    continue
+                for end_pos in ray[index + 1:]:
+                    depends.append(end_pos)
+                    if board[end_pos] is None:
+                        attacks.append(end_pos)
+                        continue
+                    if board[end_pos].get_role() != "Cannon":
+                        attacks.append(end_pos)
+                    break
+        return attacks, depends
+
+    def piece_moves(self, piece):
+        """
+        Takes a parameter that represents the piece object.
+        Yields the target square ids of the piece directly from its movement rules (the same squares that
+        valid_move accepts), without checking whether the own General is left in check.
+        """
+        board = self._board
+        piece_role = piece.get_role()
+        player_own = piece.get_player()
+        its_pos = piece.get_position()
+
+        # General, Guard and Soldier cannot be blocked
+        if piece_role == "General" or piece_role == "Guard" or piece_role == "Soldier":
+            targets = STEP_TABLE[(piece_role, player_own)][its_pos]
+        elif piece_role == "Horse":
+            targets = [target for leg, target in HORSE_MOVE[its_pos] if board[leg] is None]
+        elif piece_role == "Elephant":
+            targets = [target for (first_leg, second_leg), target in ELEPHANT_MOVE[its_pos]
+                       if board[first_leg] is None and board[second_leg] is None]
+        elif piece_role == "Chariot":
+            # Slides until the first occupied square, which can be captured
+            targets = []
+            for ray in ORTHOGONAL_RAY[its_pos] + PALACE_RAY[its_pos]:
+                for end_pos in ray:
+                    targets.append(end_pos)
+                    if board[end_pos] is not None:
+                        break
+        else:
+            # Jumps over exactly one screen (not a Cannon) and cannot capture another Cannon
+            targets = []
+            for ray in ORTHOGONAL_RAY[its_pos] + PALACE_RAY[its_pos]:
+                index = 0
+                while index < len(ray) and board[ray[index]] is None:
+                    index += 1
+                if index == len(ray) or board[ray[index]].get_role() == "Cannon":
+                    continue
+                for end_pos in ray[index + 1:]:
+                    if board[end_pos] is None:
+                        targets.append(end_pos)
+                        continue
+                    if board[end_pos].get_role() != "Cannon":
+                        targets.append(end_pos)
+                    break
+
+        for end_pos in targets:
+            # Cannot move to the square of its own piece
+            if board[end_pos] is None or board[end_pos].get_player() != player_own:
+                yield end_pos
+
+    def is_attacked(self, pos, player):
+        """
+        Takes two parameters that represent the square id and the attacking player.
+        Returns True when any remaining piece of that player can move to the square.
+        """
+        for its_pos in self.get_player_obj(player).get_positions():
+            piece_obj = self._board[its_pos]
+            # Skips a piece that is being captured
+            if piece_obj is None or piece_obj.get_player() != player:
+                continue
+            if self.valid_move(piece_obj, pos) is True:
+                return True
+        return False
 
-            # Checks whether the target square is on the board
-            if end_pos not in self.get_board_pos():
-                return False
+    def check_lines(self, player):
+        """
+        Takes a parameter that represents the player.
+        Finds once per position the lines along which the player's General can be attacked, and returns them as
+        (General's square id, checkers, lines, evasions):
+        lines maps every square on such a line (the squares between an enemy Chariot or Cannon and the General,
+        or the legs of an enemy Horse or Elephant that reaches it) to the list of those enemy pieces, so a piece
+        of the player standing on one is pinned (or is a Cannon's screen) and a piece moving onto one may block
+        a check or give a Cannon its screen;
+        checkers is the list of the (enemy piece, squares of its line) pairs that attack the General now;
+        evasions is the set of the squares a piece other than the General can move to that can answer every check
+        (the checkers' squares and lines), or None when the player is not in check.
+        The General's square is None (and nothing else is found) when the General has been captured.
+        """
+        general_pos = self.get_general_pos(player)
+        if general_pos is None:
+            return None, [], {}, None
+        opponent = "red" if player == "blue" else "blue"
+        checkers = []
+        lines = {}
+        no_changes = {}
+        for pos in self.get_player_obj(opponent).get_positions():
+            enemy = self._board[pos]
+            route = self.attack_route(enemy, general_pos)
+            if route is None:
+                continue
+            for square in route:
+                if square in lines:
+                    lines[square].append(enemy)
+                else:
+                    lines[square] = [enemy]
+            if self.attacks_square(enemy, general_pos, no_changes):
+                checkers.append((enemy, route))
+        evasions = None
+        if checkers:
+            evasions = set()
+            for enemy, route in checkers:
+                evasions.add(enemy.get_position())
+                evasions.update(route)
+        return general_pos, checkers, lines, evasions
+
+    def attack_route(self, attacker, target):
+        """
+        Takes two parameters that represent the attacking piece object and the attacked square id.
+        Returns the squares that decide whether the attacker reaches the square (the squares between for a
+        Chariot or a Cannon, the legs for a Horse or an Elephant, none for the other roles), or None when the
+        attacker cannot reach it even on an empty board.
+        """
+        attacker_role = attacker.get_role()
+        its_pos = attacker.get_position()
+        if attacker_role == "Chariot" or attacker_role == "Cannon":
+            return LINE_BETWEEN[its_pos][target]
+        if attacker_role == "Horse":
+            for leg, horse_target in HORSE_MOVE[its_pos]:
+                if horse_target == target:
+                    return (leg,)
+            return None
+        if attacker_role == "Elephant":
+            for legs, elephant_target in ELEPHANT_MOVE[its_pos]:
+                if elephant_target == target:
+                    return legs
+            return None
+        if target in STEP_TABLE[(attacker_role, attacker.get_player())][its_pos]:
+            return ()
+        return None
+
+    def is_legal_move(self, piece, end_pos):
+        """
+        Takes two parameters that represent the piece object and its target square id (a move of piece_moves).
+        Returns True when the move does not leave the own General attacked, without trying the move on the board.
+        """
+        if piece.get_role() == "General":
+            return self.is_safe_general_move(piece, end_pos)
+        return self.keeps_general_safe(piece, end_pos, self.check_lines(piece.get_player()))
 
-            # Checks the target square is whether occupied
-            pos_object = self.search_pos(end_pos)
-            if pos_object is not None:
-                # If occupied, then checks this piece belongs to which player
-                if player_own == pos_object.get_player():
-                    # If these two pieces belong to the same player, return False
+    def keeps_general_safe(self, piece, end_pos, context):
+        """
+        Takes parameters that represent a piece object other than the General, its target square id and the
+        check_lines of its player. Returns True when the move does not leave the own General attacked.
+        Every check has to be answered (the checker captured, or its line blocked or its screen changed), and
+        only the enemy pieces whose lines pass through the two squares of the move are looked at again.
+        """
+        general_pos, checkers, lines, evasions = context
+        if general_pos is None:
+            return True
+        start_pos = piece.get_position()
+        captured = self._board[end_pos]
+        for checker, route in checkers:
+            if checker is not captured and start_pos not in route and end_pos not in route:
+                return False
+        if start_pos not in lines and end_pos not in lines:
+            return True
+        # The board after the move
+        changes = {start_pos: None, end_pos: piece}
+        for square in (start_pos, end_pos):
+            for enemy in lines.get(square, ()):
+                if enemy is not captured and self.attacks_square(enemy, general_pos, changes):
                     return False
+        return True
 
-            # Check the move
-            # Moves one step orthogonally
-            first_move = [(its_pos[0] + str(int(its_pos[1:]) + 1)), (its_pos[0] + str(int(its_pos[1:]) - 1)),
-                          (chr(ord(its_pos[0]) + 1) + its_pos[1:]), (chr(ord(its_pos[0]) - 1) + its_pos[1:])]
-
-            not_block = []
-            move_lst = []
-            # Check whether it is occupied (block)
-            for index, value in enumerate(first_move):
-                if self.search_pos(value) is None:
-                    not_block.append(value)
-
-            # Moves one step diagonally outward
-            for first_pos in not_block:
-                # Move down
-                if int(first_pos[1:]) - int(its_pos[1:]) == 1:
-                    first_pos = first_pos[0] + str(int(first_pos[1:]) + 1)
-                    move_lst.append(chr(ord(first_pos[0]) + 1) + first_pos[1:])
-                    move_lst.append(chr(ord(first_pos[0]) - 1) + first_pos[1:])
-                # Move up
-                if int(first_pos[1:]) - int(its_pos[1:]) == -1:
-                    first_pos = first_pos[0] + str(int(first_pos[1:]) - 1)
-                    move_lst.append(chr(ord(first_pos[0]) + 1) + first_pos[1:])
-                    move_lst.append(chr(ord(first_pos[0]) - 1) + first_pos[1:])
-                # Move right
-                if ord(first_pos[0]) - ord(its_pos[0]) == 1:
-                    first_pos = chr(ord(first_pos[0]) + 1) + first_pos[1:]
-                    move_lst.append(first_pos[0] + str(int(first_pos[1:]) + 1))
-                    move_lst.append(first_pos[0] + str(int(first_pos[1:]) - 1))
-                # Move left
-                if ord(first_pos[0]) - ord(its_pos[0]) == -1:
-                    first_pos = chr(ord(first_pos[0]) - 1) + first_pos[1:]
-                    move_lst.append(first_pos[0] + str(int(first_pos[1:]) + 1))
-                    move_lst.append(first_pos[0] + str(int(first_pos[1:]) - 1))
-
-            valid_lst = []
-            # Gets the valid moves list
-            for move in move_lst:
-                # Check whether it is on the board
-                if move in self.get_board_pos():
-                    valid_lst.append(move)
-
-            if end_pos not in valid_lst:
+    def is_safe_general_move(self, general, end_pos):
+        """
+        Takes two parameters that represent the General object and its target square id.
+        Returns True when no enemy piece attacks the target square after the General moves there.
+        """
+        opponent = "red" if general.get_player() == "blue" else "blue"
+        captured = self._board[end_pos]
+        changes = {general.get_position(): None, end_pos: general}
+        for pos in self.get_player_obj(opponent).get_positions():
+            enemy = self._board[pos]
+            if enemy is captured or self.attack_route(enemy, end_pos) is None:
+                continue
+            if self.attacks_square(enemy, end_pos, changes):
                 return False
+        return True
+
+    def legal_targets(self, piece, context):
+        """
+        Takes two parameters that represent the piece object and the check_lines of its player.
+        Yields the target square ids of the piece's legal moves. A piece that is not on a line to its General
+        only needs its moves onto the lines checked, and in check only the moves that can answer the check
+        (onto the evasion squares, or any move of a screen or a blocker) are looked at.
+        """
+        general_pos, checkers, lines, evasions = context
+        if general_pos is None:
+            yield from self.piece_moves(piece)
+            return
+        if piece.get_role() == "General":
+            for end_pos in list(self.piece_moves(piece)):
+                if self.is_safe_general_move(piece, end_pos):
+                    yield end_pos
+            return
+        start_pos = piece.get_position()
+        if evasions is not None and start_pos not in evasions:
+            # In check: only the moves onto the checkers' squares and lines
+            for end_pos in list(self.piece_moves(piece)):
+                if end_pos in evasions and self.keeps_general_safe(piece, end_pos, context):
+                    yield end_pos
+            return
+        if evasions is None and start_pos not in lines:
+            # Not pinned: only the moves onto a line can give a Cannon a screen
+            for end_pos in list(self.piece_moves(piece)):
+                if end_pos not in lines or self.keeps_general_safe(piece, end_pos, context):
+                    yield end_pos
+            return
+        for end_pos in list(self.piece_moves(piece)):
+            if self.keeps_general_safe(piece, end_pos, context):
+                yield end_pos
+
+    def attacks_square(self, attacker, target, changes):
+        """
+        Takes parameters that represent the attacking piece object (on its square), the attacked square id and
+        the changes to the board (a dictionary from square ids to the piece object or None now on them).
+        Returns True when the attacker would capture on the square of the board with the changes made,
+        which are only looked up (the board is not changed).
+        """
+        board = self._board
+        attacker_role = attacker.get_role()
+        its_pos = attacker.get_position()
+
+        def occupant(pos):
+            # The piece on the square with the changes
+            if pos in changes:
+                return changes[pos]
+            return board[pos]
+
+        if attacker_role == "General" or attacker_role == "Guard" or attacker_role == "Soldier":
+            return target in STEP_TABLE[(attacker_role, attacker.get_player())][its_pos]
+        if attacker_role == "Horse":
+            for leg, horse_target in HORSE_MOVE[its_pos]:
+                if horse_target == target:
+                    return occupant(leg) is None
+            return False
+        if attacker_role == "Elephant":
+            for (first_leg, second_leg), elephant_target in ELEPHANT_MOVE[its_pos]:
+                if elephant_target == target:
+                    return occupant(first_leg) is None and occupant(second_leg) is None
+            return False
+        route = LINE_BETWEEN[its_pos][target]
+        if route is None:
+            return False
+        if attacker_role == "Chariot":
+            for pos in route:
+                if occupant(pos) is not None:
+                    return False
             return True
+        # Cannon: cannot capture another Cannon, and jumps over exactly one screen, which is not a Cannon
+        if occupant(target) is not None and occupant(target).get_role() == "Cannon":
+            return False
+        screen = None
+        for pos in route:
+            if occupant(pos) is not None:
+                if screen is not None:
+                    return False
+                screen = occupant(pos)
+        return screen is not None and screen.get_role() != "Cannon"
+
+    def see(self, from_sq, to_sq):
+        """
+        Takes two parameters that represent the square ids of a move (usually a capture).
+        Returns the static exchange evaluation of the move: the material (PIECE_VALUE, a General counts as
+        GENERAL_SEE_VALUE) the mover wins, or loses when negative, if both players then keep capturing on the
+        target square with their least valuable piece and either may stop when going on would lose.
+        The captures are only looked at on the board with the changes (the squares left and entered), so the
+        lines opening behind the capturers, the Cannon screens that appear or go away, the Cannons that cannot
+        capture Cannons and the palace diagonals are all followed without making any move. Pins are not
+        looked at, but a General only captures when the square is not defended any more.
+        Raises ValueError when the piece on the first square (if any) cannot move to the second.
+        """
+        board = self._board
+        if not (0 <= from_sq < 90 and 0 <= to_sq < 90) or board[from_sq] is None \
+                or self.valid_move(board[from_sq], to_sq) is False:
+            raise ValueError("No move from square id " + str(from_sq) + " to " + str(to_sq) + ".")
+        piece = board[from_sq]
+        target = board[to_sq]
+        # The pieces that can join the exchange (that reach the square on an empty board), least valuable first
+        candidates = {}
+        for player in ("blue", "red"):
+            pieces = []
+            for pos in self.get_player_obj(player).get_positions():
+                if pos == from_sq or pos == to_sq:
+                    continue
+                if self.attack_route(board[pos], to_sq) is not None:
+                    pieces.append(board[pos])
+            candidates[player] = sorted(pieces, key=lambda other: SEE_VALUE[other.get_role()])
+
+        # gains[n] is the material won by the side making the n-th capture, if the exchange stopped there
+        gains = [0 if target is None else SEE_VALUE[target.get_role()]]
+        changes = {from_sq: None, to_sq: piece}
+        on_square = piece
+        side = "red" if piece.get_player() == "blue" else "blue"
+        while True:
+            attacker = None
+            for other in candidates[side]:
+                if self.attacks_square(other, to_sq, changes):
+                    attacker = other
+                    break
+            if attacker is None:
+                break
+            opponent = "red" if side == "blue" else "blue"
+            changes[attacker.get_position()] = None
+            changes[to_sq] = attacker
+            # The General cannot capture onto a defended square
+            if attacker.get_role() == "General" and any(self.attacks_square(other, to_sq, changes)
+                                                        for other in candidates[opponent]):
+                break
+            gains.append(SEE_VALUE[on_square.get_role()] - gains[-1])
+            candidates[side].remove(attacker)
+            on_square = attacker
+            side = opponent
+
+        # Goes back through the exchange, where every side stops capturing when that is better
+        for index in range(len(gains) - 1, 0, -1):
+            gains[index - 1] = -max(-gains[index - 1], gains[index])
+        return gains[0]
+
+    def get_move_cache(self):
+        """
+        Returns the MoveCache of the legal moves of the recently visited positions (created when first asked for).
+        """
+        if self._move_cache is None:
+            self._move_cache = MoveCache()
+        return self._move_cache
+
+    def generate_moves(self, player, legal=True):
+        """
+        Takes a parameter that represents the player and an optional flag.
+        Yields the (start square id, end square id) pairs of the player's moves.
+        If legal is True, the moves that leave the own General in check are filtered out.
+        The legal moves are cached by the position hash, so asking the same position again is a lookup.
+        """
+        if legal is False:
+            for its_pos in self.get_player_obj(player).get_positions():
+                piece = self._board[its_pos]
+                for end_pos in list(self.piece_moves(piece)):
+                    yield its_pos, end_pos
+            return
+        yield from self.moves_and_check(player)[0]
+
+    def moves_and_check(self, player):
+        """
+        Takes a parameter that represents the player.
+        Returns a pair: the tuple of the player's legal moves ((start square id, end square id) pairs) and whether
+        the player is in check, both found from one check_lines and cached by the position hash.
+        """
+        cache = self.get_move_cache()
+        entry = cache.lookup(self._hash, player)
+        if entry is None:
+            # The lines to the General are found once for all the moves
+            context = self.check_lines(player)
+            moves = tuple((its_pos, end_pos) for its_pos in self.get_player_obj(player).get_positions()
+                          for end_pos in list(self.legal_targets(self._board[its_pos], context)))
+            entry = (moves, len(context[1]) > 0)
+            cache.store(self._hash, player, entry)
+        return entry
+
+    def legal_moves(self, position, legal=True):
+        """
+        Takes a parameter (string) that represents the square (ex. "b3") and an optional flag.
+        Returns the list of the squares (strings) that the piece on it can move to, or an empty list when
+        the square is empty. If legal is True, the moves that leave the own General in check are filtered out.
+        """
+        square = SQUARE_INDEX.get(position)
+        if square is None or self._board[square] is None:
+            return []
+        piece = self._board[square]
+        if legal is False:
+            return [SQUARE_NAME[end_pos] for end_pos in list(self.piece_moves(piece))]
+        cache = self.get_move_cache()
+        targets = cache.lookup(self._hash, square)
+        if targets is None:
+            targets = tuple(SQUARE_NAME[end_pos] for end_pos in
+                            list(self.legal_targets(piece, self.check_lines(piece.get_player()))))
+            cache.store(self._hash, square, targets)
+        return list(targets)
 
-        if piece_role == "Elephant":
-            # Gets the current square
-            its_pos = piece.get_position()
-            # Gets the owner
-            player_own = piece.get_player()
+    def print_board(self):
+        """
+        Print out the board (the presentation code is in JanggiDisplay, which is only imported here).
+        """
+        from JanggiDisplay import print_board
+        print_board(self)
 
-            # Checks whether the target square is on the board
-            if end_pos not in self.get_board_pos():
-                return False
 
-            # Checks the target square is whether occupied
-            pos_object = self.search_pos(end_pos)
-            if pos_object is not None:
-                # If occupied, then checks this piece belongs to which player
-                if player_own == pos_object.get_player():
-                    # If these two pieces belong to the same player, return False
-                    return False
+class MoveListener:
+    """
+    Represents a listener of the moves made by make_move. The methods do nothing,
+    so a subclass only overrides the events it needs.
+    """
 
-            # Check the move
-            first_move = [(its_pos[0] + str(int(its_pos[1:]) + 1)), (its_pos[0] + str(int(its_pos[1:]) - 1)),
-                          (chr(ord(its_pos[0]) + 1) + its_pos[1:]), (chr(ord(its_pos[0]) - 1) + its_pos[1:])]
-            not_block = []
-            second_move = []
-
-            # Check whether it is occupied (block)
-            for index, value in enumerate(first_move):
-                if self.search_pos(value) is None:
-                    not_block.append(value)
-
-            # Check one step diagonally outward whether is blocked
-            for first_pos in not_block:
-                # Move down
-                if int(first_pos[1:]) - int(its_pos[1:]) == 1:
-                    first_pos = first_pos[0] + str(int(first_pos[1:]) + 1)
-                    block_1 = chr(ord(first_pos[0]) + 1) + first_pos[1:]
-                    block_2 = chr(ord(first_pos[0]) - 1) + first_pos[1:]
-                    first_pos = first_pos[0] + str(int(first_pos[1:]) + 1)
-                    if self.search_pos(block_1) is None:
-                        second_move.append(chr(ord(first_pos[0]) + 2) + first_pos[1:])
-                    if self.search_pos(block_2) is None:
-                        second_move.append(chr(ord(first_pos[0]) - 2) + first_pos[1:])
-
-                # Move up
-                if int(first_pos[1:]) - int(its_pos[1:]) == -1:
-                    first_pos = first_pos[0] + str(int(first_pos[1:]) - 1)
-                    block_3 = chr(ord(first_pos[0]) + 1) + first_pos[1:]
-                    block_4 = chr(ord(first_pos[0]) - 1) + first_pos[1:]
-                    first_pos = first_pos[0] + str(int(first_pos[1:]) - 1)
-                    if self.search_pos(block_3) is None:
-                        second_move.append(chr(ord(first_pos[0]) + 2) + first_pos[1:])
-                    if self.search_pos(block_4) is None:
-                        second_move.append(chr(ord(first_pos[0]) - 2) + first_pos[1:])
-
-                # Move right
-                if ord(first_pos[0]) - ord(its_pos[0]) == 1:
-                    first_pos = chr(ord(first_pos[0]) + 1) + first_pos[1:]
-                    block_5 = first_pos[0] + str(int(first_pos[1:]) + 1)
-                    block_6 = first_pos[0] + str(int(first_pos[1:]) - 1)
-                    first_pos = chr(ord(first_pos[0]) + 1) + first_pos[1:]
-                    if self.search_pos(block_5) is None:
-                        second_move.append(first_pos[0] + str(int(first_pos[1:]) + 2))
-                    if self.search_pos(block_6) is None:
-                        second_move.append(first_pos[0] + str(int(first_pos[1:]) - 2))
-
-                # Move left
-                if ord(first_pos[0]) - ord(its_pos[0]) == -1:
-                    first_pos = chr(ord(first_pos[0]) - 1) + first_pos[1:]
-                    block_7 = first_pos[0] + str(int(first_pos[1:]) + 1)
-                    block_8 = first_pos[0] + str(int(first_pos[1:]) - 1)
-                    first_pos = chr(ord(first_pos[0]) - 1) + first_pos[1:]
-                    if self.search_pos(block_7) is None:
-                        second_move.append(first_pos[0] + str(int(first_pos[1:]) + 2))
-                    if self.search_pos(block_8) is None:
-                        second_move.append(first_pos[0] + str(int(first_pos[1:]) - 2))
-
-            # Get the last possible route
-            last_move = []
-            # Gets the valid moves list
-            for move in second_move:
-                # Check whether it is on the board
-                if move in self.get_board_pos():
-                    last_move.append(move)
-
-            if end_pos not in second_move:
-                return False
-            return True
+    def on_attempt(self, game, start_pos, end_pos):
+        """
+        Called when make_move is called with the two squares (strings).
+        """
+        pass
 
-        if piece_role == "Chariot":
-            # Gets the current square
-            its_pos = piece.get_position()
-            # Gets the owner
-            player_own = piece.get_player()
+    def on_accept(self, game, start_pos, end_pos):
+        """
+        Called when the move (or passing the turn) is made.
+        """
+        pass
 
-            # Checks whether the target square is on the board
-            if end_pos not in self.get_board_pos():
-                return False
+    def on_reject(self, game, start_pos, end_pos, reason):
+        """
+        Called when the move is rejected, with the reason: "NOT_ON_BOARD", "NO_PIECE", "IN_CHECK" (cannot pass),
+        "NOT_YOUR_TURN", "ILLEGAL_MOVE", "GAME_OVER" or "GENERAL_IN_CHECK" (the own General is left in check).
+        """
+        pass
 
-            # Checks the target square is whether occupied
-            pos_object = self.search_pos(end_pos)
-            if pos_object is not None:
-                # If occupied, then checks this piece belongs to which player
-                if player_own == pos_object.get_player():
-                    # If these two pieces belong to the same player, return False
-                    return False
+    def on_check(self, game, player):
+        """
+        Called when the move puts the player ("blue" or "red") in check.
+        """
+        pass
 
-            # In the palace
-            case_dic = {1: ["d8", "e9", "f10"], 2: ["d10", "e9", "f8"], 3: ["d1", "e2", "f3"], 4: ["d3", "e2", "f1"]}
-            for num in range(1, 5):
-                case = case_dic[num]
-                if its_pos in case and end_pos in case:
-                    if (its_pos == case[0] and end_pos == case[2]) and self.search_pos(case[1]) is not None:
-                        return False
-                    if (its_pos == case[2] and end_pos == case[0]) and self.search_pos(case[1]) is not None:
-                        return False
-                    return True
-
-            # Check move
-            vertical_lst = []
-            horizontal_lst = []
-            # Go forward or backward:
-            if (ord(end_pos[0]) - ord(its_pos[0])) == 0:
-                pos_range = (int(end_pos[1:]) - int(its_pos[1:]))
-                # move one step
-                if abs(pos_range) == 1:
-                    return True
-                if pos_range > 0:
-                    for num in range(1, pos_range):
-                        rows = int(its_pos[1:]) + num
-                        position = its_pos[0] + str(rows)
-                        vertical_lst.append(position)
-                else:
-                    for num in range(1, abs(pos_range)):
-                        rows = int(its_pos[1:]) - num
-                        position = its_pos[0] + str(rows)
-                        vertical_lst.append(position)
-
-            # Go left or right
-            if (int(end_pos[1:]) - int(its_pos[1:])) == 0:
-                pos_range = (ord(end_pos[0]) - ord(its_pos[0]))
-                # move one step
-                if abs(pos_range) == 1:
-                    return True
-                if pos_range > 0:
-                    for num in range(1, pos_range):
-                        columns = ord(its_pos[0]) + num
-                        position = chr(columns) + str(its_pos[1:])
-                        horizontal_lst.append(position)
-                else:
-                    for num in range(1, abs(pos_range)):
-                        columns = ord(its_pos[0]) - num
-                        position = chr(columns) + str(its_pos[1:])
-                        horizontal_lst.append(position)
+    def on_game_end(self, game, state):
+        """
+        Called when the move ends the game, with the game state ("RED_WON" or "BLUE_WON").
+        """
+        pass
 
-            # Not moving vertically or horizontally
-            if vertical_lst == [] and horizontal_lst == []:
-                return False
 
-            # Check whether there is a piece between the route
-            ver_occupied = []
-            hor_occupied = []
-            for pos in vertical_lst:
-                if self.search_pos(pos) is not None:
-                    ver_occupied.append(pos)
+class BufferedLogListener(MoveListener):
+    """
+    Represents a listener that writes one line per event into a buffer, which is flushed to a stream
+    (a file-like object) or a logging.Logger when it is full, when the game ends, or when flush is called.
+    Inherits from MoveListener.
+    """
 
-            for pos in horizontal_lst:
-                if self.search_pos(pos) is not None:
-                    hor_occupied.append(pos)
+    def __init__(self, stream=None, logger=None, buffer_size=256):
+        """
+        Takes optional parameters that represent the stream, the logger and how many lines to buffer.
+        Creates a listener object with different private data members and initializes all data members.
+        """
+        self._stream = stream
+        self._logger = logger
+        self._buffer_size = buffer_size
+        self._buffer = []
 
-            if ver_occupied == [] and hor_occupied == []:
-                return True
-            return False
+    def get_buffer(self):
+        """
+        Returns the lines that are not flushed yet.
+        """
+        return self._buffer
 
-        if piece_role == "Cannon":
-            # Gets the current square
-            its_pos = piece.get_position()
-            # Gets the owner
-            player_own = piece.get_player()
+    def write(self, line):
+        """
+        Takes a parameter that represents a line. Adds it to the buffer and flushes the buffer when it is full.
+        """
+        self._buffer.append(line)
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
 
-            # Checks whether the target square is on the board
-            if end_pos not in self.get_board_pos():
-                return False
+    def flush(self):
+        """
+        Writes the buffered lines to the stream or the logger and empties the buffer.
+        """
+        if self._stream is not None:
+            self._stream.write("".join(line + "\n" for line in self._buffer))
+        if self._logger is not None:
+            for line in self._buffer:
+                self._logger.info(line)
+        self._buffer = []
 
-            # Checks the target square is whether occupied
-            pos_object = self.search_pos(end_pos)
-            if pos_object is not None:
-                # If occupied, then checks this piece belongs to which player
-                if player_own == pos_object.get_player():
-                    # If these two pieces belong to the same player, return False
-                    return False
-                # The target square cannot be another Cannon
-                if pos_object.get_role() == "Cannon":
-                    return False
+    def on_attempt(self, game, start_pos, end_pos):
+        """
+        Writes the attempted move.
+        """
+        self.write("Attempting:  " + str(start_pos) + " -> " + str(end_pos))
 
-            # In the palace
-            case_dic = {1: ["d8", "e9", "f10"], 2: ["d10", "e9", "f8"], 3: ["d1", "e2", "f3"], 4: ["d3", "e2", "f1"]}
-            for num in range(1, 5):
-                case = case_dic[num]
-                if its_pos in case and end_pos in case:
-                    if (its_pos == case[0] and end_pos == case[2]) and self.search_pos(case[1]) is not None:
-                        return True
-                    if (its_pos == case[2] and end_pos == case[0]) and self.search_pos(case[1]) is not None:
-                        return True
-                    return False
+    def on_accept(self, game, start_pos, end_pos):
+        """
+        Writes the move that is made.
+        """
+        self.write("Accepted:  " + str(start_pos) + " -> " + str(end_pos))
 
-            # Check move
-            vertical_lst = []
-            horizontal_lst = []
-            # Go forward or backward:
-            if (ord(end_pos[0]) - ord(its_pos[0])) == 0:
-                pos_range = (int(end_pos[1:]) - int(its_pos[1:]))
-                if pos_range > 0:
-                    for num in range(1, pos_range):
-                        rows = int(its_pos[1:]) + num
-                        position = its_pos[0] + str(rows)
-                        vertical_lst.append(position)
-                else:
-                    for num in range(1, abs(pos_range)):
-                        rows = int(its_pos[1:]) - num
-                        position = its_pos[0] + str(rows)
-                        vertical_lst.append(position)
-            # Go left or right
-            if (int(end_pos[1:]) - int(its_pos[1:])) == 0:
-                pos_range = (ord(end_pos[0]) - ord(its_pos[0]))
-                if pos_range > 0:
-                    for num in range(1, pos_range):
-                        columns = ord(its_pos[0]) + num
-                        position = chr(columns) + str(its_pos[1:])
-                        horizontal_lst.append(position)
-                else:
-                    for num in range(1, abs(pos_range)):
-                        columns = ord(its_pos[0]) - num
-                        position = chr(columns) + str(its_pos[1:])
-                        horizontal_lst.append(position)
-            # Not moving vertically or horizontally
-            if vertical_lst == [] and horizontal_lst == []:
-                return False
+    def on_reject(self, game, start_pos, end_pos, reason):
+        """
+        Writes the rejected move and the reason.
+        """
+        self.write("Rejected:  " + str(start_pos) + " -> " + str(end_pos) + " (" + reason + ")")
 
-            ver_screen = []
-            hor_screen = []
-            for pos in vertical_lst:
-                if self.search_pos(pos) is not None:
-                    ver_screen.append(pos)
-
-            for pos in horizontal_lst:
-                if self.search_pos(pos) is not None:
-                    hor_screen.append(pos)
-
-            # Between two squares can only exist one element
-            if len(ver_screen) == 1 and (hor_screen == []):
-                for element in ver_screen:
-                    # Cannot cross another Cannon
-                    if self.search_pos(element).get_role() == "Cannon":
-                        return False
-                return True
-            if (ver_screen == []) and (len(hor_screen) == 1):
-                for element in hor_screen:
-                    # Cannot cross another Cannon
-                    if self.search_pos(element).get_role() == "Cannon":
-                        return False
-                return True
-            return False
+    def on_check(self, game, player):
+        """
+        Writes the player who is in check.
+        """
+        self.write("In check:  " + player)
 
-        if piece_role == "Soldier":
-            # Gets the current square
-            its_pos = piece.get_position()
-            # Gets the owner
-            player_own = piece.get_player()
+    def on_game_end(self, game, state):
+        """
+        Writes the game state and flushes the buffer.
+        """
+        self.write("Game over:  " + state)
+        self.flush()
 
-            # Checks whether the target square is on the board
-            if end_pos not in self.get_board_pos():
-                return False
 
-            # Checks the target square is whether occupied
-            pos_object = self.search_pos(end_pos)
-            if pos_object is not None:
-                # If occupied, then checks this piece belongs to which player
-                if player_own == pos_object.get_player():
-                    # If these two pieces belong to the same player, return False
-                    return False
+class MoveRecord:
+    """
+    Represents a move made by push_move, which stores everything needed to take it back.
+    """
+    __slots__ = ("_piece", "_start_pos", "_end_pos", "_captured", "_captured_slot", "_whose_turn", "_game_state",
+                 "_track", "_hash")
 
-            # Check the move
-            if (int(its_pos[1:]) - int(end_pos[1:])) == 0:
-                if abs(ord(its_pos[0]) - ord(end_pos[0])) == 1:
-                    return True
-            # They cannot move backward, so find who owns it
-            if ord(its_pos[0]) - ord(end_pos[0]) == 0:
-                if player_own == "blue":
-                    if (int(its_pos[1:]) - int(end_pos[1:])) == 1:
-                        return True
-                else:
-                    if (int(its_pos[1:]) - int(end_pos[1:])) == -1:
-                        return True
-
-            # Soldiers may also move one point diagonally "forward" when within the enemy palace
-            if its_pos in self.get_palace_all():
-                if player_own == "blue":
-                    if its_pos == "d3" and end_pos == "e2":
-                        return True
-                    if its_pos == "f3" and end_pos == "e2":
-                        return True
-                    if its_pos == "e2" and end_pos == "d1":
-                        return True
-                    if its_pos == "e2" and end_pos == "f1":
-                        return True
-                if player_own == "red":
-                    if its_pos == "d8" and end_pos == "e9":
-                        return True
-                    if its_pos == "f8" and end_pos == "e9":
-                        return True
-                    if its_pos == "e9" and end_pos == "d10":
-                        return True
-                    if its_pos == "e9" and end_pos == "f10":
-                        return True
-            return False
+    def __init__(self, piece, start_pos, end_pos, captured, captured_slot, whose_turn, game_state, track_blue,
+                 track_red, position_hash):
+        """
+        Creates a move record object with different private data members and initializes all data members.
+        """
+        self._piece = piece
+        self._start_pos = start_pos
+        self._end_pos = end_pos
+        # The captured piece object and its slot in the player's piece array (None when nothing is captured)
+        self._captured = captured
+        self._captured_slot = captured_slot
+        # The status before the move
+        self._whose_turn = whose_turn
+        self._game_state = game_state
+        self._track = (track_blue, track_red)
+        self._hash = position_hash
 
-    def print_board(self):
+    def get_piece(self):
         """
-        Print out the board.
-        """
-        rows = [["a1", "b1", "c1", "d1", "e1", "f1", "g1", "h1", "i1"],
-                ["a2", "b2", "c2", "d2", "e2", "f2", "g2", "h2", "i2"],
-                ["a3", "b3", "c3", "d3", "e3", "f3", "g3", "h3", "i3"],
-                ["a4", "b4", "c4", "d4", "e4", "f4", "g4", "h4", "i4"],
-                ["a5", "b5", "c5", "d5", "e5", "f5", "g5", "h5", "i5"],
-                ["a6", "b6", "c6", "d6", "e6", "f6", "g6", "h6", "i6"],
-                ["a7", "b7", "c7", "d7", "e7", "f7", "g7", "h7", "i7"],
-                ["a8", "b8", "c8", "d8", "e8", "f8", "g8", "h8", "i8"],
-                ["a9", "b9", "c9", "d9", "e9", "f9", "g9", "h9", "i9"],
-                ["a10", "b10", "c10", "d10", "e10", "f10", "g10", "h10", "i10"]]
-
-        for pos in self.get_board():
-            piece = self.get_board()[pos]
-            if piece is None:
-                pieces = "空"
-                color = "white"
-            else:
-                player = piece.get_player()
-                role = piece.get_role()
-                if player == "blue":
-                    color = "blue"
-                else:
-                    color = "red"
-                # Role
-                if role == "General":
-                    pieces = "將"
-                elif role == "Guard":
-                    pieces = "士"
-                elif role == "Elephant":
-                    pieces = "象"
-                elif role == "Horse":
-                    pieces = "馬"
-                elif role == "Chariot":
-                    pieces = "車"
-                elif role == "Soldier":
-                    pieces = "兵"
-                else:
-                    pieces = "包"
-            # Player
-
-            for num in range(1, 11):
-                if int(pos[1:]) == num:
-                    for index, position in enumerate(rows[num-1]):
-                        if pos == position:
-                            rows[num-1][index] = colored(pieces, color)
-
-        columns = ["a", " b", " c", "d", " e", "f", " g", "h", " i"]
-        print(" ", *columns, sep=' * ')
-        for index, row in enumerate(rows):
-            if index == 9:
-                print(0, *row, sep=' | ')
-            else:
-                print((index + 1), *row, sep=' | ')
+        Returns the moved piece object.
+        """
+        return self._piece
+
+    def get_start_pos(self):
+        """
+        Returns the square id moved from.
+        """
+        return self._start_pos
+
+    def get_end_pos(self):
+        """
+        Returns the square id moved to.
+        """
+        return self._end_pos
+
+    def get_captured(self):
+        """
+        Returns the captured piece object (None when nothing is captured).
+        """
+        return self._captured
+
+    def get_captured_slot(self):
+        """
+        Returns the captured piece's slot in the player's piece array.
+        """
+        return self._captured_slot
+
+    def get_whose_turn(self):
+        """
+        Returns the player whose turn it was before the move.
+        """
+        return self._whose_turn
+
+    def get_game_state(self):
+        """
+        Returns the game state before the move (None when it was still to be found from the board).
+        """
+        return self._game_state
+
+    def get_track(self):
+        """
+        Returns the (blue, red) lists that tracked the generals' legal moves before the move.
+        """
+        return self._track
+
+    def get_hash(self):
+        """
+        Returns the position's Zobrist hash before the move.
+        """
+        return self._hash
+
+    def is_pass(self):
+        """
+        Returns True when the move passed the turn.
+        """
+        return self._start_pos == self._end_pos
 
 
 class Piece:
     """
     Represents piece objects on the board.
+    The data members are slots (no per-object dictionary) and the role is stored once per class.
     """
+    __slots__ = ("_player", "_position")
+    _role = None
 
     def __init__(self, player, position):
         """
@@ -1045,35 +1559,39 @@ class Piece:
         """
         return self._player
 
+    def get_role(self):
+        """
+        Returns the piece's role.
+        """
+        return self._role
+
     def get_position(self):
         """
-        Returns the current position.
+        Returns the current position (square id).
         """
         return self._position
 
     def set_position(self, new_pos):
         """
-        Takes a new position as a parameter.
+        Takes a new position (square id) as a parameter.
         Sets to the new position.
         """
         self._position = new_pos
 
+    def copy(self):
+        """
+        Returns a new piece object of the same class, player and position.
+        """
+        return self.__class__(self._player, self._position)
+
 
 class General(Piece):
     """
     Represents a General.
     Inherits from Piece.
     """
-
-    def __init__(self, player, position):
-        super().__init__(player, position)
-        self._role = "General"
-
-    def get_role(self):
-        """
-        Returns the piece's role.
-        """
-        return self._role
+    __slots__ = ()
+    _role = "General"
 
 
 class Guard(Piece):
@@ -1081,16 +1599,8 @@ class Guard(Piece):
     Represents a Guard.
     Inherits from Piece.
     """
-
-    def __init__(self, player, position):
-        super().__init__(player, position)
-        self._role = "Guard"
-
-    def get_role(self):
-        """
-        Returns the piece's role.
-        """
-        return self._role
+    __slots__ = ()
+    _role = "Guard"
 
 
 class Horse(Piece):
@@ -1098,33 +1608,17 @@ class Horse(Piece):
     Represents a Horse.
     Inherits from Piece.
     """
-
-    def __init__(self, player, position):
-        super().__init__(player, position)
-        self._role = "Horse"
-
-    def get_role(self):
-        """
-        Returns the piece's role.
-        """
-        return self._role
+    __slots__ = ()
+    _role = "Horse"
 
 
 class Elephant(Piece):
     """
     Represents an Elephant.
-    Inherits from Rectangle
+    Inherits from Piece.
     """
-
-    def __init__(self, player, position):
-        super().__init__(player, position)
-        self._role = "Elephant"
-
-    def get_role(self):
-        """
-        Returns the piece's role.
-        """
-        return self._role
+    __slots__ = ()
+    _role = "Elephant"
 
 
 class Chariot(Piece):
@@ -1132,16 +1626,8 @@ class Chariot(Piece):
     Represents a Chariot.
     Inherits from Piece.
     """
-
-    def __init__(self, player, position):
-        super().__init__(player, position)
-        self._role = "Chariot"
-
-    def get_role(self):
-        """
-        Returns the piece's role.
-        """
-        return self._role
+    __slots__ = ()
+    _role = "Chariot"
 
 
 class Cannon(Piece):
@@ -1149,16 +1635,8 @@ class Cannon(Piece):
     Represents a Cannons.
     Inherits from Piece.
     """
-
-    def __init__(self, player, position):
-        super().__init__(player, position)
-        self._role = "Cannon"
-
-    def get_role(self):
-        """
-        Returns the piece's role.
-        """
-        return self._role
+    __slots__ = ()
+    _role = "Cannon"
 
 
 class Soldier(Piece):
@@ -1166,34 +1644,44 @@ class Soldier(Piece):
     Represents a Soldier.
     Inherits from Piece.
     """
+    __slots__ = ()
+    _role = "Soldier"
 
-    def __init__(self, player, position):
-        super().__init__(player, position)
-        self._role = "Soldier"
 
-    def get_role(self):
-        """
-        Returns the piece's role.
-        """
-        return self._role
+# The piece class of every role
+ROLE_CLASS = {"General": General, "Guard": Guard, "Horse": Horse, "Elephant": Elephant, "Chariot": Chariot,
+              "Cannon": Cannon, "Soldier": Soldier}
+# The piece class, the Zobrist keys and the piece-square values of every (player, role), looked up once per piece
+# when a position is set up
+PIECE_SETUP = {(player, role): (ROLE_CLASS[role], ZOBRIST_PIECE[(player, role)], PIECE_SQUARE_BLUE[(player, role)])
+               for player in ("blue", "red") for role in ROLES}
 
 
-class Blue:
+class Player:
     """
-    Represents a blue player.
+    Represents a player ("blue" or "red").
+    The remaining pieces are kept in a small array of square ids indexed by the slots of PIECE_KEYS,
+    where a captured piece is CAPTURED.
     """
-    def __init__(self):
+    __slots__ = ("_player", "_squares")
+
+    def __init__(self, player, squares=None):
+        """
+        Takes a parameter that represents the player ("blue" or "red") and an optional sequence of the square ids
+        of the pieces in the order of PIECE_KEYS (the initial setup by default).
+        Creates a player object with different private data members and initializes all data members.
+        """
+        self._player = player
+        # Initializes the array used to track the player's remaining pieces (square ids)
+        if squares is None:
+            squares = START_SQUARES[player]
+        self._squares = array("b", squares)
+
+    def copy(self):
         """
-        Creates a blue player object with different private data members and initializes all data members.
+        Returns a new player object with a copy of the piece array.
         """
-        self._player = "blue"
-        # Initializes the in check status to False
-        self._in_check = False
-        # Initializes the dictionary used to track the player's remaining pieces to the initial setup
-        self._remain_piece = {"Chariot1": "a10", "Elephant1": "b10", "Horse1": "c10", "Guard1": "d10", "General": "e9",
-                              "Guard2": "f10", "Elephant2": "g10", "Horse2": "h10", "Chariot2": "i10", "Cannon1": "b8",
-                              "Cannon2": "h8", "Soldier1": "a7", "Soldier2": "c7", "Soldier3": "e7", "Soldier4": "g7",
-                              "Soldier5": "i7"}
+        return Player(self._player, self._squares)
 
     def get_player(self):
         """
@@ -1201,130 +1689,395 @@ class Blue:
         """
         return self._player
 
-    def get_in_check(self):
+    def get_remain_piece(self):
         """
-        Returns the player's in check status.
+        Returns a new dictionary of the player's remaining pieces, which stores the keys (ex. "Chariot1") as keys
+        and the square ids as values.
         """
-        return self._in_check
+        return {PIECE_KEYS[slot]: pos for slot, pos in enumerate(self._squares) if pos != CAPTURED}
 
-    def set_in_check(self, status):
+    def get_positions(self):
         """
-        Takes one parameter.
-        Sets the player's in check status to the new status.
+        Returns the list of the square ids of the player's remaining pieces.
         """
-        self._in_check = status
+        return [pos for pos in self._squares if pos != CAPTURED]
 
-    def get_remain_piece(self):
+    def get_square(self, slot):
         """
-        Returns the player's remaining pieces dictionary.
+        Takes a parameter that represents the slot of the piece (ex. GENERAL_SLOT).
+        Returns the square id of that piece, or None when it has been captured.
         """
-        return self._remain_piece
+        pos = self._squares[slot]
+        if pos == CAPTURED:
+            return None
+        return pos
+
+    def get_slot(self, pos):
+        """
+        Takes a parameter that represents the square id.
+        Returns the slot of the player's piece on that square, or None when there is none.
+        """
+        if pos not in self._squares:
+            return None
+        return self._squares.index(pos)
+
+    def get_size_bytes(self):
+        """
+        Returns the memory used by the player object and its piece array in bytes.
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self._squares)
 
     def remove_piece(self, piece):
         """
         Takes a parameter that represents the piece object.
-        According to its position to remove the piece from the remaining piece dictionary.
+        According to its position to remove the piece from the remaining pieces.
+        Returns the removed piece's slot, which is used to add it back.
         """
         position = piece.get_position()
-        # Notice: RuntimeError-dictionary changed size during iteration (Use list to solve)
-        for role, pos in list(self._remain_piece.items()):
-            if pos == position:
-                del self._remain_piece[role]
+        if position not in self._squares:
+            return None
+        slot = self._squares.index(position)
+        self._squares[slot] = CAPTURED
+        return slot
 
     def update_position(self, piece, end_pos):
         """
-        Takes two parameters that represent the piece object and the square.
+        Takes two parameters that represent the piece object and the square id.
         Updates the player's pieces' position.
         """
         position = piece.get_position()
-        for role, pos in list(self._remain_piece.items()):
-            if pos == position:
-                self._remain_piece[role] = end_pos
+        if position in self._squares:
+            self._squares[self._squares.index(position)] = end_pos
 
-    def restore_removed(self, piece, pos):
+    def restore_removed(self, slot, pos):
         """
-        Takes two parameters that represent the piece object and the square.
+        Takes two parameters that represent the removed piece's slot and the square id.
         Add back the piece that being removed.
         """
-        role = piece.get_role
-        self._remain_piece[role] = pos
+        self._squares[slot] = pos
+
+    def add_piece(self, role, pos):
+        """
+        Takes two parameters that represent the role and the square id.
+        Puts the piece into the first free slot of that role and returns the slot.
+        Raises ValueError when every slot of that role is used.
+        """
+        for slot in ROLE_SLOTS[role]:
+            if self._squares[slot] == CAPTURED:
+                self._squares[slot] = pos
+                return slot
+        raise ValueError("Too many pieces of the role " + role + ".")
 
 
-class Red:
+class GameSnapshot:
     """
-    Represents a red player.
+    Represents a read-only position taken from a JanggiGame by snapshot(), for spectators and what-if analysis.
+    The layout is a tuple of 90 entries (None or (player, role) pairs), so the snapshot cannot be changed and
+    does not follow the game. to_game() makes a new game from it when one is needed.
     """
-    def __init__(self):
+    __slots__ = ("_layout", "_whose_turn", "_game_state", "_in_check", "_track", "_hash")
+
+    def __init__(self, layout, whose_turn, game_state, in_check, track, position_hash):
         """
-        Creates a red player object with different private data members and initializes all data members.
+        Creates a snapshot object with different private data members and initializes all data members.
         """
-        self._player = "red"
-        # Initializes the in check status to False
-        self._in_check = False
-        # Initializes the dictionary used to track the player's remaining pieces to the initial setup
-        self._remain_piece = {"Chariot1": "a1", "Elephant1": "b1", "Horse1": "c1", "Guard1": "d1", "General": "e2",
-                              "Guard2": "f1", "Elephant2": "g1", "Horse2": "h1", "Chariot2": "i1", "Cannon1": "b3",
-                              "Cannon2": "h3", "Soldier1": "a4", "Soldier2": "c4", "Soldier3": "e4", "Soldier4": "g4",
-                              "Soldier5": "i4"}
+        self._layout = layout
+        self._whose_turn = whose_turn
+        self._game_state = game_state
+        self._in_check = in_check
+        self._track = track
+        self._hash = position_hash
 
-    def get_player(self):
+    def get_layout(self):
         """
-        Returns the player's identity.
+        Returns the tuple of 90 entries (None or (player, role) pairs) indexed by the square id.
         """
-        return self._player
+        return self._layout
 
-    def get_in_check(self):
+    def get_board(self):
         """
-        Returns the player's in check status.
+        Returns the board as a dictionary, which stores the positions (ex. "b3") as keys
+        and the (player, role) pairs (or None) as values.
         """
-        return self._in_check
+        return dict(zip(SQUARE_NAME, self._layout))
 
-    def set_in_check(self, status):
+    def search_pos(self, pos):
         """
-        Takes one parameter.
-        Sets the player's in check status to the new status.
+        Takes a parameter that represents the square id.
+        Returns the (player, role) pair of the piece on it, or None.
         """
-        self._in_check = status
+        return self._layout[pos]
 
-    def get_remain_piece(self):
+    def get_whose_turn(self):
         """
-        Returns the player's remaining pieces dictionary.
+        Returns the player whose turn it was.
         """
-        return self._remain_piece
+        return self._whose_turn
 
-    def remove_piece(self, piece):
+    def get_game_state(self):
         """
-        Takes a parameter that represents the piece object.
-        According to its position to remove the piece from the remaining piece dictionary.
+        Returns the game state.
         """
-        position = piece.get_position()
-        # Notice: RuntimeError-dictionary changed size during iteration (Use list to solve)
-        for role, pos in list(self._remain_piece.items()):
-            if pos == position:
-                del self._remain_piece[role]
+        return self._game_state
 
-    def update_position(self, piece, end_pos):
+    def is_in_check(self, player):
         """
-        Takes two parameters that represent the piece object and the square.
-        Updates the player's pieces' position.
+        Takes as a parameter either "red" or "blue" and returns True if that player was in check.
         """
-        position = piece.get_position()
-        for role, pos in list(self._remain_piece.items()):
-            if pos == position:
-                self._remain_piece[role] = end_pos
+        if player == "blue":
+            return self._in_check[0]
+        return self._in_check[1]
 
-    def restore_removed(self, piece, pos):
+    def get_track(self):
         """
-        Takes two parameters that represent the piece object and the square.
-        Add back the piece that being removed.
+        Returns the (blue, red) tuples that tracked the generals' legal moves.
+        """
+        return self._track
+
+    def position_hash(self):
+        """
+        Returns the Zobrist hash of the position.
+        """
+        return self._hash
+
+    def to_game(self):
+        """
+        Returns a new JanggiGame object set up at this position.
+        """
+        game = JanggiGame()
+        game.load_snapshot(self)
+        return game
+
+
+class MoveCache:
+    """
+    Represents a bounded cache of the legal moves of the recently visited positions, keyed by the position hash.
+    Every move changes the hash, so the entries never go stale: a new position simply misses, and going back
+    to a position (taking a move back, or stepping through a replay) finds its moves again. The least recently
+    used position is dropped when the cache is full.
+    """
+    __slots__ = ("_capacity", "_entries", "_hits", "_misses", "_evictions")
+
+    def __init__(self, capacity=MOVE_CACHE_SIZE):
+        """
+        Takes an optional parameter that represents the number of positions to keep.
+        Creates a cache object with different private data members and initializes all data members.
+        Raises ValueError when the capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive.")
+        self._capacity = capacity
+        # The entries of the positions (oldest first): the hash maps to a dictionary from the query
+        # (a player for the pair of all the player's moves and its check status, or a square id for the moves of
+        # one piece) to the moves
+        self._entries = OrderedDict()
+        # Counters
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        """
+        Returns the number of positions in the cache.
+        """
+        return len(self._entries)
+
+    def get_capacity(self):
+        """
+        Returns the number of positions the cache can hold.
+        """
+        return self._capacity
+
+    def lookup(self, key, query):
+        """
+        Takes two parameters that represent the position hash and the query (a player or a square id).
+        Returns the cached moves (a tuple, or a (moves, in check) pair for a player), or None when they are not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            moves = entry.get(query)
+            if moves is not None:
+                self._hits += 1
+                return moves
+        self._misses += 1
+        return None
+
+    def store(self, key, query, moves):
+        """
+        Takes parameters that represent the position hash, the query (a player or a square id) and the moves
+        (a tuple, or a (moves, in check) pair for a player). Stores the moves, dropping the least recently used position when the cache is full.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {}
+            if len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        entry[query] = moves
+
+    def clear(self):
+        """
+        Empties the cache and resets the counters.
+        """
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_stats(self):
+        """
+        Returns a dictionary of the counters: hits, misses, evictions (positions dropped), the hit rate,
+        the number of cached positions and the capacity.
+        """
+        lookups = self._hits + self._misses
+        return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0, "positions": len(self._entries),
+                "capacity": self._capacity}
+
+    def get_size_bytes(self):
+        """
+        Returns the memory used by the cache and its entries in bytes (the shared square names are not counted).
+        """
+        size = sys.getsizeof(self) + sys.getsizeof(self._entries)
+        for entry in self._entries.values():
+            size += sys.getsizeof(entry)
+            for query, moves in entry.items():
+                # The moves of a player are kept in a pair with its check status
+                if isinstance(query, str):
+                    size += sys.getsizeof(moves)
+                    moves = moves[0]
+                size += sys.getsizeof(moves) + sum(sys.getsizeof(move) for move in moves
+                                                   if isinstance(move, tuple))
+        return size
+
+
+class ReplayResult:
+    """
+    Represents the result of replaying a game: how many moves were made, and the first rejected move
+    with its ply index and reason (None when every move was made).
+    """
+
+    def __init__(self, index, plies, reason, move, game_state):
+        """
+        Creates a replay result object with different private data members and initializes all data members.
+        """
+        self._index = index
+        self._plies = plies
+        self._reason = reason
+        self._move = move
+        self._game_state = game_state
+
+    def get_index(self):
+        """
+        Returns the index of the game in the stream.
+        """
+        return self._index
+
+    def get_plies(self):
+        """
+        Returns the number of moves made, which is also the ply index of the rejected move.
+        """
+        return self._plies
+
+    def get_reason(self):
         """
-        role = piece.get_role
-        self._remain_piece[role] = pos
+        Returns the reason why the move was rejected (None when every move was made).
+        """
+        return self._reason
+
+    def get_move(self):
+        """
+        Returns the rejected move (None when every move was made).
+        """
+        return self._move
+
+    def get_game_state(self):
+        """
+        Returns the game state after the replay.
+        """
+        return self._game_state
+
+    def is_valid(self):
+        """
+        Returns True when every move was made.
+        """
+        return self._reason is None
+
+    def __repr__(self):
+        """
+        Returns the text form of the result.
+        """
+        return "ReplayResult(index={}, plies={}, reason={}, move={}, game_state={})".format(
+            self._index, self._plies, self._reason, self._move, self._game_state)
+
+
+def parse_notation(notation):
+    """
+    Takes a parameter that represents a position string (see JanggiGame.to_notation).
+    Returns the (layout, whose_turn) pair, where the layout is a list of 90 entries (None or (player, role) pairs)
+    indexed by the square id. Raises ValueError when the string is not valid.
+    """
+    fields = notation.split()
+    if len(fields) == 0:
+        raise ValueError("Empty position notation.")
+    whose_turn = "blue"
+    if len(fields) > 1:
+        whose_turn = LETTER_TURN.get(fields[1])
+        if whose_turn is None:
+            raise ValueError("Bad side to move: " + fields[1])
+    layout = [None] * 90
+    pos = 0
+    for letter in fields[0]:
+        if letter == "/":
+            if pos % 9 != 0 or pos == 0:
+                raise ValueError("Bad rank length in: " + fields[0])
+        elif letter in "123456789":
+            pos += int(letter)
+        else:
+            piece = LETTER_PIECE.get(letter)
+            if piece is None or pos >= 90:
+                raise ValueError("Bad piece letter or too many squares in: " + fields[0])
+            layout[pos] = piece
+            pos += 1
+    if pos != 90:
+        raise ValueError("The position must have 10 ranks of 9 squares: " + fields[0])
+    return layout, whose_turn
+
+
+def parse_moves(text):
+    """
+    Takes a parameter that represents a string of moves separated by spaces or commas,
+    each one written as "c7c6", "c7-c6" or "c7:c6".
+    Yields the (start, end) pairs of strings, or None for a move that cannot be read.
+    """
+    for token in text.replace(",", " ").split():
+        token = token.replace("-", "").replace(":", "")
+        # The end square starts at the second letter
+        split = 1
+        while split < len(token) and token[split].isdigit():
+            split += 1
+        if split == 1 or split == len(token):
+            yield None
+        else:
+            yield token[:split], token[split:]
+
+
+def replay_stream(games):
+    """
+    Takes a parameter that represents any iterable of games (ex. a list, a generator or an opened file with one game
+    per line), where every game is an iterable of (start, end) pairs or a string of moves.
+    Replays every game in a new JanggiGame and yields the ReplayResult of each game one at a time.
+    """
+    for index, moves in enumerate(games):
+        yield JanggiGame().replay(moves, index)
 
 
 if __name__ == '__main__':
     # Example Game - Red Wins 
     game = JanggiGame()
+    # Track tests
+    game.add_listener(BufferedLogListener(sys.stdout, buffer_size=1))
     print(game.make_move("c7", "c6"))  # Soldier (blue)
     print(game.make_move("c1", "d3"))  # Horse (red)
     print(game.make_move("b10", "d7"))  # Elephant (blue)
@@ -0,0 +1,86 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: Measures the import time of the rules engine and checks that it stays headless
+# (no third-party modules and no presentation code are imported).
+import os
+import subprocess
+import sys
+import time
+
+# The modules of the rules engine and the modules they must not import
+CORE_MODULES = ("JanggiGame", "JanggiTables")
+FORBIDDEN_MODULES = ("termcolor", "JanggiDisplay")
+# The budget of the import time of JanggiGame (on top of the bare interpreter start-up) in milliseconds
+IMPORT_BUDGET_MS = 15
+RUNS = 20
+
+
+def run_python(code, importtime=False):
+    """
+    Takes a parameter that represents the code and an optional flag for -X importtime.
+    Runs the code in a new interpreter in this directory (with the bytecode cache on)
+    and returns the (seconds, stderr) of the run.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    start_time = time.perf_counter()
+    result = subprocess.run(command + ["-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    return time.perf_counter() - start_time, result.stderr
+
+
+def spawn_time(code, runs=RUNS):
+    """
+    Takes a parameter that represents the code and an optional number of runs.
+    Returns the fastest wall time of starting an interpreter that runs the code, in milliseconds.
+    """
+    return min(run_python(code)[0] for _ in range(runs)) * 1000
+
+
+def module_times(module):
+    """
+    Takes a parameter that represents the module to import.
+    Returns the dictionary of the cumulative import time (microseconds) of every module imported with it.
+    """
+    times = {}
+    for line in run_python("import " + module, importtime=True)[1].splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def loaded_modules(module):
+    """
+    Takes a parameter that represents the module to import.
+    Returns the list of the forbidden modules loaded by importing it.
+    """
+    code = "import sys, " + module + "; print(*[name for name in " + repr(FORBIDDEN_MODULES) + \
+           " if name in sys.modules], file=sys.stderr)"
+    return run_python(code)[1].split()
+
+
+def run_benchmark():
+    """
+    Prints the import times of the core modules and the spawn time on top of the bare interpreter.
+    Returns True when the engine is headless and within the budget, otherwise False.
+    """
+    # Warms the bytecode cache
+    run_python("import " + ", ".join(CORE_MODULES))
+    times = module_times("JanggiGame")
+    for module in CORE_MODULES:
+        print("import", module, round(times.get(module, 0) / 1000, 2), "ms")
+    extra = spawn_time("import JanggiGame") - spawn_time("pass")
+    print("spawn overhead of JanggiGame", round(extra, 2), "ms (budget", IMPORT_BUDGET_MS, "ms)")
+    forbidden = loaded_modules("JanggiGame")
+    if forbidden:
+        print("imported by JanggiGame:", *forbidden)
+    return len(forbidden) == 0 and extra <= IMPORT_BUDGET_MS
+
+
+if __name__ == '__main__':
+    sys.exit(0 if run_benchmark() else 1)
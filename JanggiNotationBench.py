@@ -0,0 +1,80 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: Measures how many positions per minute are loaded from position strings (from_notation)
+# and checks the rate against its budget.
+import random
+import sys
+import time
+
+from JanggiGame import JanggiGame
+
+# The budget of the positions loaded per minute by from_notation
+NOTATION_BUDGET_PER_MINUTE = 1000000
+# The sample: the positions of random games from the start board (the seed keeps it the same on every run)
+SAMPLE_SIZE = 2000
+SAMPLE_SEED = 7
+MAX_PLIES = 120
+RUNS = 5
+
+
+def sample_positions(size=SAMPLE_SIZE, seed=SAMPLE_SEED):
+    """
+    Takes optional parameters that represent the number of positions and the seed.
+    Returns the list of the position strings of random legal games, started again every MAX_PLIES plies.
+    """
+    rng = random.Random(seed)
+    game = JanggiGame()
+    positions = []
+    while len(positions) < size:
+        moves = list(game.generate_moves(game.get_whose_turn()))
+        if not moves or len(game.get_history()) >= MAX_PLIES:
+            game = JanggiGame()
+            continue
+        game.push_move(*rng.choice(moves))
+        positions.append(game.to_notation())
+    return positions
+
+
+def positions_per_minute(positions, with_state=False, runs=RUNS):
+    """
+    Takes parameters that represent the position strings, an optional flag and an optional number of runs.
+    Returns the fastest rate of loading all of them into one game (and asking the game state when with_state
+    is True), in positions per minute.
+    """
+    game = JanggiGame()
+    best = None
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        for notation in positions:
+            game.from_notation(notation)
+            if with_state:
+                game.get_game_state()
+        elapsed = time.perf_counter() - start_time
+        if best is None or elapsed < best:
+            best = elapsed
+    return len(positions) / best * 60
+
+
+def run_benchmark():
+    """
+    Prints the positions loaded per minute, with and without finding the game state.
+    Returns True when the positions load back to the same strings and the rate is within the budget,
+    otherwise False.
+    """
+    positions = sample_positions()
+    game = JanggiGame()
+    mismatches = 0
+    for notation in positions:
+        game.from_notation(notation)
+        if game.to_notation() != notation:
+            mismatches += 1
+    rate = positions_per_minute(positions)
+    print("from_notation", round(rate), "positions per minute (budget", str(NOTATION_BUDGET_PER_MINUTE) + ")")
+    print("from_notation and get_game_state", round(positions_per_minute(positions, True)), "positions per minute")
+    if mismatches:
+        print("positions not loaded back to the same string:", mismatches)
+    return mismatches == 0 and rate >= NOTATION_BUDGET_PER_MINUTE
+
+
+if __name__ == '__main__':
+    sys.exit(0 if run_benchmark() else 1)
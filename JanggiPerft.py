@@ -0,0 +1,174 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: Perft (counting the leaf nodes of the move tree) to check and benchmark the move generation.
+import sys
+import time
+
+from JanggiTables import SQUARE_NAME, SQUARE_INDEX
+
+# The positions of the suite: the moves played from the start board and the pinned node counts of every depth
+# (without passing the turn). The counts agree between JanggiGame and BitboardJanggiGame.
+PERFT_SUITE = {
+    # The opening layout
+    "start": ([], {1: 31, 2: 961, 3: 30506, 4: 967906}),
+    # The blue Cannon on b8 uses the Soldier on b7 as a screen but cannot capture the red Cannon on b3
+    "cannon_cannot_capture_cannon": ([("a7", "b7")], {1: 31, 2: 1149, 3: 36514}),
+    # The blue Cannon on f8 jumps along the palace's diagonal over its General on e9 to d10
+    "palace_cannon": ([("d10", "d9"), ("e4", "f4"), ("h10", "g8"), ("h1", "g3"), ("h8", "f8")],
+                      {1: 33, 2: 1182, 3: 40711}),
+    # The red Chariot on the palace's center e2 slides along the diagonals
+    "palace_chariot": ([("c7", "b7"), ("e2", "e3"), ("b7", "c7"), ("i1", "i2"), ("c7", "b7"), ("i2", "e2")],
+                       {1: 32, 2: 1281, 3: 41739}),
+    # The red Chariot on f10 checks the blue General on e9 along the palace's diagonal
+    "palace_check": ([("c7", "c6"), ("i1", "i2"), ("c6", "b6"), ("i4", "i5"), ("i10", "i8"), ("i2", "f2"),
+                      ("i7", "i6"), ("f2", "f10")], {1: 3, 2: 116, 3: 3077}),
+    # The Horses on g8 and g3 have legs blocked by the Soldiers on g7 and g4 and the Cannons on h8 and h3,
+    # which unblock them by moving
+    "horse_legs": ([("h10", "g8"), ("h1", "g3")], {1: 35, 2: 1223, 3: 42901}),
+    # The Elephants on d7 and d4 have legs blocked by the Soldiers beside them, which unblock them by moving
+    "elephant_legs": ([("b10", "d7"), ("b1", "d4")], {1: 33, 2: 1089, 3: 36731}),
+    # The red Cannons on e3 and h3 are each other's only screen along the third rank, so neither can jump
+    # to the empty squares behind the other
+    "cannon_screen_cannon": ([("c7", "c6"), ("c1", "d3"), ("i7", "i6"), ("b3", "e3"), ("a7", "a6"), ("d3", "e5")],
+                             {1: 33, 2: 1088, 3: 35315}),
+}
+
+# The passes checked on both engines: the moves made by make_move from the start board, the pass (the same square
+# twice) and whether make_move accepts it. A pass is decided by the player whose turn it is, whichever piece's square
+# it names, and nothing is accepted once the game is over.
+PASS_SUITE = {
+    # Red passes by naming its General (not in check)
+    "not_in_check": ([("c7", "c6")], ("e2", "e2"), True),
+    # Blue is in check from the red Chariot on f10, so it cannot pass by naming its own piece or the Chariot
+    "in_check_own_piece": (PERFT_SUITE["palace_check"][0], ("e9", "e9"), False),
+    "in_check_opponent_piece": (PERFT_SUITE["palace_check"][0], ("f10", "f10"), False),
+    # Blue passes until the red Chariot on e9 checkmates its General on e8
+    "game_over": ([("e9", "e9"), ("a4", "b4"), ("e9", "e9"), ("h1", "g3"), ("e9", "e9"), ("e4", "e5"), ("e9", "e9"),
+                   ("b1", "d4"), ("e9", "e9"), ("h3", "d3"), ("e9", "e9"), ("i1", "h1"), ("e9", "e9"), ("h1", "h8"),
+                   ("e9", "e9"), ("a1", "a5"), ("e9", "e9"), ("a5", "b5"), ("e9", "e9"), ("h8", "h9"), ("f10", "f9"),
+                   ("b5", "d5"), ("e9", "e9"), ("d5", "d10"), ("e9", "e8"), ("h9", "f9"), ("e8", "e8"), ("f9", "e9")],
+                  ("e8", "e8"), False),
+}
+
+
+def perft(game, depth, passes=False):
+    """
+    Takes parameters that represent the game (JanggiGame or BitboardJanggiGame), the depth and an optional flag.
+    Returns the number of leaf nodes of the legal move tree of that depth. If passes is True,
+    passing the turn (when not in check) is counted as a move too.
+    """
+    player = game.get_whose_turn()
+    moves = list(game.generate_moves(player))
+    if passes and not game_in_check(game, player):
+        general_pos = game.get_general_pos(player)
+        moves.append((general_pos, general_pos))
+    # The moves of the last depth do not need to be played
+    if depth <= 1:
+        if depth <= 0:
+            return 1
+        return len(moves)
+    nodes = 0
+    for start, end in moves:
+        game.push_move(start, end)
+        nodes += perft(game, depth - 1, passes)
+        game.pop_move()
+    return nodes
+
+
+def divide(game, depth, passes=False):
+    """
+    Takes parameters that represent the game, the depth and an optional flag.
+    Returns the dictionary that breaks the perft count down by root move (ex. "c7c6").
+    """
+    player = game.get_whose_turn()
+    moves = list(game.generate_moves(player))
+    if passes and not game_in_check(game, player):
+        general_pos = game.get_general_pos(player)
+        moves.append((general_pos, general_pos))
+    counts = {}
+    for start, end in moves:
+        game.push_move(start, end)
+        counts[SQUARE_NAME[start] + SQUARE_NAME[end]] = perft(game, depth - 1, passes)
+        game.pop_move()
+    return counts
+
+
+def game_in_check(game, player):
+    """
+    Takes two parameters that represent the game and the player.
+    Returns True when the player's General is attacked on the current board.
+    """
+    opponent = "red" if player == "blue" else "blue"
+    return game.is_attacked(game.get_general_pos(player), opponent)
+
+
+def setup_position(engine, moves):
+    """
+    Takes two parameters that represent the game class and the moves (pairs of strings) played from the start.
+    Returns the game after the moves (they are pushed without printing or checking).
+    """
+    game = engine()
+    for start_pos, end_pos in moves:
+        game.push_move(SQUARE_INDEX[start_pos], SQUARE_INDEX[end_pos])
+    return game
+
+
+def run_perft(game, max_depth, passes=False):
+    """
+    Takes parameters that represent the game, the deepest depth and an optional flag.
+    Returns the list of (depth, nodes, nodes per second) of every depth from 1 to max_depth.
+    """
+    results = []
+    for depth in range(1, max_depth + 1):
+        start_time = time.perf_counter()
+        nodes = perft(game, depth, passes)
+        elapsed = time.perf_counter() - start_time
+        results.append((depth, nodes, int(nodes / elapsed) if elapsed > 0 else 0))
+    return results
+
+
+def run_suite(engine, max_depth=3):
+    """
+    Takes two parameters that represent the game class and the deepest depth.
+    Runs every position of the suite, prints the node counts and the nodes per second,
+    and returns the list of the (position, depth, nodes, expected) that do not match the pinned counts.
+    """
+    mismatches = []
+    for name, (moves, expected) in PERFT_SUITE.items():
+        game = setup_position(engine, moves)
+        for depth, nodes, nps in run_perft(game, min(max_depth, max(expected))):
+            status = "ok" if expected.get(depth) == nodes else "MISMATCH"
+            print(engine.__name__, name, "depth", depth, "nodes", nodes, "nps", nps, status)
+            if expected.get(depth) != nodes:
+                mismatches.append((name, depth, nodes, expected.get(depth)))
+    return mismatches
+
+
+def run_pass_checks(engine):
+    """
+    Takes a parameter that represents the game class.
+    Makes the moves of every case of PASS_SUITE, tries the pass and prints whether make_move answers as expected.
+    Returns the list of the (case, answer, expected) that do not match.
+    """
+    mismatches = []
+    for name, (moves, (start_pos, end_pos), expected) in PASS_SUITE.items():
+        game = engine()
+        for move in moves:
+            if not game.make_move(*move):
+                raise ValueError("The move " + move[0] + move[1] + " of the pass case " + name + " is rejected.")
+        answer = game.make_move(start_pos, end_pos)
+        print(engine.__name__, "pass", name, answer, "ok" if answer == expected else "MISMATCH")
+        if answer != expected:
+            mismatches.append((name, answer, expected))
+    return mismatches
+
+
+if __name__ == '__main__':
+    from JanggiGame import JanggiGame
+    from JanggiBitboard import BitboardJanggiGame
+
+    mismatches = (run_suite(BitboardJanggiGame) + run_suite(JanggiGame) + run_pass_checks(BitboardJanggiGame) +
+                  run_pass_checks(JanggiGame))
+    if mismatches:
+        print("mismatches:", *mismatches)
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,261 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: A compact binary record format of Janggi games and a memory-mapped database to replay them.
+import mmap
+import os
+import struct
+
+from JanggiGame import JanggiGame, ReplayResult, parse_moves
+from JanggiTables import SQUARE_NAME, SQUARE_INDEX
+
+# The file starts with the magic bytes and the format version
+FILE_MAGIC = b"JANGGI"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<6sH")
+# Every game starts with its header: the starting setup, the result and the number of moves
+GAME_HEADER = struct.Struct("<BBH")
+# The starting setups (only the start_board of JanggiGame for now) and the games they start
+SETUP_START_BOARD = 0
+SETUP_GAME = {SETUP_START_BOARD: JanggiGame}
+# The results
+RESULT_CODE = {"UNFINISHED": 0, "BLUE_WON": 1, "RED_WON": 2}
+RESULT_NAME = {code: name for name, code in RESULT_CODE.items()}
+# Every move is two bytes (from square id, to square id), and this reserved code passes the turn
+PASS_CODE = 0xFF
+MAX_MOVES = 0xFFFF
+
+
+def encode_game(moves, result="UNFINISHED", setup=SETUP_START_BOARD):
+    """
+    Takes a parameter that represents the moves ((start, end) pairs of strings, where the same square twice passes
+    the turn) and optional parameters that represent the result and the starting setup.
+    Returns the game packed into bytes: the game header, then two bytes per move.
+    Raises ValueError when a square is not on the board.
+    """
+    packed = bytearray()
+    for start_pos, end_pos in moves:
+        if start_pos == end_pos:
+            packed += bytes((PASS_CODE, PASS_CODE))
+        elif start_pos not in SQUARE_INDEX or end_pos not in SQUARE_INDEX:
+            raise ValueError("The move " + str(start_pos) + str(end_pos) + " is not on the board.")
+        else:
+            packed += bytes((SQUARE_INDEX[start_pos], SQUARE_INDEX[end_pos]))
+    count = len(packed) // 2
+    if count > MAX_MOVES:
+        raise ValueError("A game record can hold at most 65535 moves.")
+    return GAME_HEADER.pack(setup, RESULT_CODE[result], count) + bytes(packed)
+
+
+def write_games(file_obj, games):
+    """
+    Takes two parameters that represent a file opened for binary writing and an iterable of games,
+    where every game is a list of (start, end) pairs, a string of moves (ex. "c7c6 c1d3"),
+    or a (moves, result) pair. Writes the file header and every game.
+    Returns the number of games written. Raises ValueError naming the game when one of its moves cannot be read.
+    """
+    file_obj.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+    count = 0
+    for game in games:
+        result = "UNFINISHED"
+        if isinstance(game, tuple) and len(game) == 2 and isinstance(game[1], str) and game[1] in RESULT_CODE:
+            game, result = game
+        text = game
+        if isinstance(game, str):
+            game = list(parse_moves(game))
+            if None in game:
+                raise ValueError("Game " + str(count) + " has a move that cannot be read: " + repr(text))
+        try:
+            file_obj.write(encode_game(game, result))
+        except ValueError as error:
+            raise ValueError("Game " + str(count) + " (" + repr(text) + "): " + str(error)) from error
+        count += 1
+    return count
+
+
+def decode_moves(data):
+    """
+    Takes a parameter that represents the moves of one game (bytes or a memoryview, two bytes per move).
+    Yields the (start, end) pairs of strings, or (PASS_CODE, PASS_CODE) for passing the turn.
+    """
+    for index in range(0, len(data) - 1, 2):
+        start, end = data[index], data[index + 1]
+        if start == PASS_CODE:
+            yield PASS_CODE, PASS_CODE
+        else:
+            yield SQUARE_NAME[start], SQUARE_NAME[end]
+
+
+class GameDatabase:
+    """
+    Represents a file of game records, which is memory-mapped, so the games are read
+    straight from the mapped pages (without copying the file into memory).
+    The move slices handed out by iterate_records are views of the mapped pages: the mapping stays open until
+    the database is closed and the last slice is released (or garbage collected), whichever comes later.
+    Raises ValueError when the file is not a game record file or a game is cut short.
+    """
+
+    def __init__(self, path):
+        """
+        Takes a parameter that represents the path of the file.
+        Creates a database object with different private data members and initializes all data members.
+        Raises ValueError (and closes the file) when the file is not a game record file.
+        """
+        # The offsets of the games (found when they are first needed)
+        self._offsets = None
+        self._closed = False
+        self._map = None
+        self._view = None
+        self._file = open(path, "rb")
+        try:
+            if os.fstat(self._file.fileno()).st_size < FILE_HEADER.size:
+                raise ValueError("The file is too short.")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map)
+            magic, version = FILE_HEADER.unpack_from(self._view, 0)
+            if magic != FILE_MAGIC or version != FILE_VERSION:
+                raise ValueError("The magic bytes or the version do not match.")
+        except (ValueError, OSError, struct.error) as error:
+            self.close()
+            raise ValueError("Not a Janggi game record file (version " + str(FILE_VERSION) + "): " +
+                             str(error)) from error
+
+    def close(self):
+        """
+        Closes the file and unmaps it. When move slices from iterate_records are still held, the mapping is
+        left to be unmapped when the last of them is released. Closing twice does nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._view is not None:
+                self._view.release()
+            if self._map is not None:
+                self._map.close()
+        except BufferError:
+            # Slices are still exported: the mapping is freed together with them
+            pass
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        """
+        Returns the database (used by the with statement).
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Closes the database at the end of the with statement.
+        """
+        self.close()
+
+    def iterate_records(self):
+        """
+        Yields the (setup, result, moves) of every game, where moves is a memoryview of the mapped file
+        (two bytes per move).
+        """
+        view = self._view
+        offset = FILE_HEADER.size
+        size = len(view)
+        while offset < size:
+            self.check_record(offset)
+            setup, result, count = GAME_HEADER.unpack_from(view, offset)
+            offset += GAME_HEADER.size
+            yield setup, RESULT_NAME.get(result, "UNFINISHED"), view[offset:offset + 2 * count]
+            offset += 2 * count
+
+    def check_record(self, offset):
+        """
+        Takes a parameter that represents the offset of a game in the file.
+        Returns the number of moves of the game. Raises ValueError when the file ends inside the game.
+        """
+        size = len(self._view)
+        if offset + GAME_HEADER.size > size:
+            raise ValueError("The game record at offset " + str(offset) + " is cut short.")
+        count = GAME_HEADER.unpack_from(self._view, offset)[2]
+        if offset + GAME_HEADER.size + 2 * count > size:
+            raise ValueError("The game record at offset " + str(offset) + " is cut short.")
+        return count
+
+    def get_offsets(self):
+        """
+        Returns the list of the offsets of every game in the file.
+        """
+        if self._offsets is None:
+            offsets = []
+            view = self._view
+            offset = FILE_HEADER.size
+            while offset < len(view):
+                offsets.append(offset)
+                offset += GAME_HEADER.size + 2 * self.check_record(offset)
+            self._offsets = offsets
+        return self._offsets
+
+    def __len__(self):
+        """
+        Returns the number of games in the file.
+        """
+        return len(self.get_offsets())
+
+    def get_moves(self, index):
+        """
+        Takes a parameter that represents the index of the game.
+        Returns the list of the game's (start, end) pairs of strings (passes are (PASS_CODE, PASS_CODE)).
+        """
+        offset = self.get_offsets()[index]
+        count = GAME_HEADER.unpack_from(self._view, offset)[2]
+        start = offset + GAME_HEADER.size
+        return list(decode_moves(self._view[start:start + 2 * count]))
+
+    def replay_all(self):
+        """
+        Replays every game from its starting setup and yields the ReplayResult of each game one at a time.
+        The moves go from the mapped pages to the game as square ids (see replay_packed).
+        Raises ValueError when a game has an unknown starting setup.
+        """
+        for index, (setup, result, moves) in enumerate(self.iterate_records()):
+            try:
+                if setup not in SETUP_GAME:
+                    raise ValueError("Game " + str(index) + " has an unknown starting setup " + str(setup) + ".")
+                yield replay_packed(SETUP_GAME[setup](), moves, index)
+            finally:
+                moves.release()
+
+
+def replay_packed(game, data, index=0):
+    """
+    Takes parameters that represent the game, the packed moves (bytes or a memoryview, two bytes per move) and
+    an optional index of the game. Makes the moves one by one straight from the square ids (without going
+    through the square names) and stops at the first move that is rejected.
+    Returns a ReplayResult object, where the rejected move is a (start, end) pair of strings.
+    """
+    ply = 0
+    for offset in range(0, len(data) - 1, 2):
+        start, end = data[offset], data[offset + 1]
+        if start == PASS_CODE:
+            # Passing the turn uses the square of the General of the player to move
+            start = end = game.get_general_pos(game.get_whose_turn())
+            if start is None:
+                return ReplayResult(index, ply, "NO_PIECE", (PASS_CODE, PASS_CODE), game.get_game_state())
+        reason = game.play_square_move(start, end)
+        if reason is not None:
+            move = tuple(SQUARE_NAME[square] if square < 90 else str(square) for square in (start, end))
+            return ReplayResult(index, ply, reason, move, game.get_game_state())
+        ply += 1
+    return ReplayResult(index, ply, None, None, game.get_game_state())
+
+
+if __name__ == '__main__':
+    # Example - converts text games to the binary format and replays them
+    import tempfile
+
+    text_games = ["c7c6 c1d3 b10d7 b3e3 c10d8 h1g3 e7e6 e3e6", "a7b7 a4a5 e9e9 a5a6", "c7c6 b3b10"]
+    path = os.path.join(tempfile.gettempdir(), "janggi_games.bin")
+    with open(path, "wb") as out:
+        write_games(out, text_games)
+    with GameDatabase(path) as database:
+        print(len(database), "games,", os.path.getsize(path), "bytes")
+        for replay_result in database.replay_all():
+            print(replay_result)
+    os.remove(path)
@@ -0,0 +1,318 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: An asyncio server that hosts many JanggiGame sessions over a JSON-lines protocol, and its client.
+import asyncio
+import json
+import time
+
+from JanggiGame import JanggiGame
+
+# The largest request line the server reads
+MAX_LINE = 64 * 1024
+# How many latencies of every request kind are kept for the percentiles
+LATENCY_SAMPLES = 1024
+
+
+class JanggiServer:
+    """
+    Represents a server whose single event loop hosts the game sessions of every client. The protocol is one JSON
+    object per line: a request {"op": ..., "id": ...} gets one response {"id": ..., "ok": ...}. The requests are:
+    create, move (game, start, end), state (game), is_in_check (game, player), close (game) and metrics.
+    """
+
+    def __init__(self):
+        """
+        Creates a server object with different private data members and initializes all data members.
+        """
+        # The games by game id
+        self._sessions = {}
+        self._next_id = 1
+        self._server = None
+        # The latencies of every request kind: [count, total seconds, max seconds, recent samples]
+        self._latency = {}
+        self._handlers = {"create": self.handle_create, "move": self.handle_move, "state": self.handle_state,
+                          "is_in_check": self.handle_is_in_check, "close": self.handle_close,
+                          "metrics": self.handle_metrics}
+
+    def get_sessions(self):
+        """
+        Returns the dictionary of the games by game id.
+        """
+        return self._sessions
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Takes optional parameters that represent the host and the port (0 picks a free port).
+        Starts listening on TCP and returns the (host, port) the server listens on.
+        """
+        self._server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path):
+        """
+        Takes a parameter that represents the path of the Unix socket.
+        Starts listening on the Unix socket.
+        """
+        self._server = await asyncio.start_unix_server(self.handle_client, path, limit=MAX_LINE)
+
+    async def stop(self):
+        """
+        Stops listening and waits until the server is closed.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        """
+        Serves the clients until the task is cancelled.
+        """
+        await self._server.serve_forever()
+
+    async def handle_client(self, reader, writer):
+        """
+        Takes two parameters that represent the stream reader and writer of a connection.
+        Answers the requests of the connection one line at a time until it is closed.
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"ok": false, "error": "LINE_TOO_LONG"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    response = self.handle_line(line)
+                except Exception as error:
+                    # A request that still fails gets an error response, and the connection stays open
+                    response = (json.dumps({"ok": False, "error": "INTERNAL_ERROR",
+                                            "detail": type(error).__name__}) + "\n").encode()
+                writer.write(response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle_line(self, line):
+        """
+        Takes a parameter that represents a request line (bytes).
+        Returns the response line (bytes), and records the latency of the request.
+        """
+        start_time = time.perf_counter()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            return b'{"ok": false, "error": "BAD_REQUEST"}\n'
+        op = request.get("op")
+        handler = self._handlers.get(op) if isinstance(op, str) else None
+        if handler is None:
+            response = {"ok": False, "error": "UNKNOWN_OP"}
+        else:
+            try:
+                response = handler(request)
+            except (KeyError, TypeError):
+                response = {"ok": False, "error": "BAD_REQUEST"}
+            except Exception as error:
+                response = {"ok": False, "error": "INTERNAL_ERROR", "detail": type(error).__name__}
+        if "id" in request:
+            response["id"] = request["id"]
+        if handler is not None:
+            self.record_latency(op, time.perf_counter() - start_time)
+        return (json.dumps(response) + "\n").encode()
+
+    def record_latency(self, op, elapsed):
+        """
+        Takes two parameters that represent the request kind and the seconds it took.
+        Adds the latency to the metrics of that request kind.
+        """
+        metric = self._latency.get(op)
+        if metric is None:
+            metric = self._latency[op] = [0, 0.0, 0.0, []]
+        metric[0] += 1
+        metric[1] += elapsed
+        if elapsed > metric[2]:
+            metric[2] = elapsed
+        samples = metric[3]
+        if len(samples) < LATENCY_SAMPLES:
+            samples.append(elapsed)
+        else:
+            samples[metric[0] % LATENCY_SAMPLES] = elapsed
+
+    def get_metrics(self):
+        """
+        Returns the dictionary of the metrics: the number of sessions, and for every request kind its count and
+        its mean, p50, p99 and max latency in microseconds.
+        """
+        latency = {}
+        for op, (count, total, longest, samples) in self._latency.items():
+            ordered = sorted(samples)
+            latency[op] = {"count": count, "mean_us": round(total / count * 1e6, 1),
+                           "p50_us": round(ordered[len(ordered) // 2] * 1e6, 1),
+                           "p99_us": round(ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)] * 1e6, 1),
+                           "max_us": round(longest * 1e6, 1)}
+        return {"sessions": len(self._sessions), "latency": latency}
+
+    def handle_create(self, request):
+        """
+        Takes a parameter that represents the request.
+        Creates a new game and returns the response with its game id.
+        """
+        game_id = "g" + str(self._next_id)
+        self._next_id += 1
+        self._sessions[game_id] = JanggiGame()
+        return {"ok": True, "game": game_id}
+
+    def handle_move(self, request):
+        """
+        Takes a parameter that represents the request with the game id and the start and end squares.
+        Makes the move and returns the response with the reason when the move is rejected.
+        """
+        game = self._sessions.get(request["game"])
+        if game is None:
+            return {"ok": False, "error": "NO_GAME"}
+        reason = game.play_move(str(request["start"]), str(request["end"]))
+        return {"ok": reason is None, "reason": reason, "game_state": game.get_game_state(),
+                "whose_turn": game.get_whose_turn()}
+
+    def handle_state(self, request):
+        """
+        Takes a parameter that represents the request with the game id.
+        Returns the response with the game state, the player to move and the number of moves made.
+        """
+        game = self._sessions.get(request["game"])
+        if game is None:
+            return {"ok": False, "error": "NO_GAME"}
+        return {"ok": True, "game_state": game.get_game_state(), "whose_turn": game.get_whose_turn(),
+                "plies": len(game.get_history())}
+
+    def handle_is_in_check(self, request):
+        """
+        Takes a parameter that represents the request with the game id and the player.
+        Returns the response with whether the player is in check.
+        """
+        game = self._sessions.get(request["game"])
+        if game is None:
+            return {"ok": False, "error": "NO_GAME"}
+        if request["player"] not in ("blue", "red"):
+            return {"ok": False, "error": "BAD_PLAYER"}
+        return {"ok": True, "in_check": game.is_in_check(request["player"])}
+
+    def handle_close(self, request):
+        """
+        Takes a parameter that represents the request with the game id.
+        Removes the game and returns the response.
+        """
+        if self._sessions.pop(request["game"], None) is None:
+            return {"ok": False, "error": "NO_GAME"}
+        return {"ok": True}
+
+    def handle_metrics(self, request):
+        """
+        Takes a parameter that represents the request.
+        Returns the response with the metrics of the server.
+        """
+        response = self.get_metrics()
+        response["ok"] = True
+        return response
+
+
+class JanggiClient:
+    """
+    Represents a client of a JanggiServer, which sends one request at a time over a connection.
+    """
+
+    def __init__(self):
+        """
+        Creates a client object with different private data members and initializes all data members.
+        """
+        self._reader = None
+        self._writer = None
+        self._next_id = 1
+
+    async def connect(self, host="127.0.0.1", port=None, path=None):
+        """
+        Takes optional parameters that represent the host and port of TCP, or the path of a Unix socket.
+        Connects to the server.
+        """
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+
+    async def close(self):
+        """
+        Closes the connection.
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def request(self, op, **fields):
+        """
+        Takes parameters that represent the request kind and its fields (ex. game="g1", start="c7", end="c6").
+        Sends the request and returns the response dictionary.
+        """
+        request = {"op": op, "id": self._next_id}
+        request.update(fields)
+        self._next_id += 1
+        self._writer.write((json.dumps(request) + "\n").encode())
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def create(self):
+        """
+        Creates a game on the server and returns its game id.
+        """
+        return (await self.request("create"))["game"]
+
+    async def make_move(self, game_id, start_pos, end_pos):
+        """
+        Takes three parameters that represent the game id and the start and end squares.
+        Returns True when the move is made, otherwise False (like JanggiGame.make_move).
+        """
+        return (await self.request("move", game=game_id, start=start_pos, end=end_pos))["ok"]
+
+    async def get_game_state(self, game_id):
+        """
+        Takes a parameter that represents the game id.
+        Returns the game state.
+        """
+        return (await self.request("state", game=game_id))["game_state"]
+
+    async def is_in_check(self, game_id, player):
+        """
+        Takes two parameters that represent the game id and the player.
+        Returns True when the player is in check, otherwise False.
+        """
+        return (await self.request("is_in_check", game=game_id, player=player))["in_check"]
+
+
+if __name__ == '__main__':
+    # Example - many clients play the example opening at the same time against a local server
+    MOVES = [("c7", "c6"), ("c1", "d3"), ("b10", "d7"), ("b3", "e3"), ("c10", "d8"), ("h1", "g3"), ("e7", "e6"),
+             ("e3", "e6")]
+
+    async def play(port):
+        client = JanggiClient()
+        await client.connect(port=port)
+        game_id = await client.create()
+        results = [await client.make_move(game_id, start_pos, end_pos) for start_pos, end_pos in MOVES]
+        in_check = await client.is_in_check(game_id, "blue")
+        await client.request("close", game=game_id)
+        await client.close()
+        return results, in_check
+
+    async def main():
+        server = JanggiServer()
+        host, port = await server.start()
+        outcomes = await asyncio.gather(*(play(port) for _ in range(200)))
+        print(outcomes[0], all(outcome == outcomes[0] for outcome in outcomes))
+        print(server.get_metrics())
+        await server.stop()
+
+    asyncio.run(main())
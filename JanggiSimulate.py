@@ -0,0 +1,197 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: Plays many JanggiGame games in parallel worker processes for self-play and test corpora.
+import multiprocessing
+import os
+import random
+
+from JanggiGame import JanggiGame
+from JanggiTables import SQUARE_NAME, PIECE_VALUE
+from JanggiRecord import FILE_HEADER, FILE_MAGIC, FILE_VERSION, GAME_HEADER, RESULT_NAME, encode_game, decode_moves
+
+# Games still unfinished after this many plies are stopped
+MAX_PLIES = 300
+
+
+def random_policy(game, rng):
+    """
+    Takes two parameters that represent the game and the random number generator of the game.
+    Returns a random legal move as a (start, end) pair of strings, passing the turn when there is no move.
+    """
+    player = game.get_whose_turn()
+    moves = list(game.generate_moves(player))
+    if len(moves) == 0:
+        general_pos = SQUARE_NAME[game.get_general_pos(player)]
+        return general_pos, general_pos
+    start, end = rng.choice(moves)
+    return SQUARE_NAME[start], SQUARE_NAME[end]
+
+
+def capture_policy(game, rng):
+    """
+    Takes two parameters that represent the game and the random number generator of the game.
+    Returns the legal move that captures the most valuable piece (a random one among the best),
+    as a (start, end) pair of strings, passing the turn when there is no move.
+    """
+    player = game.get_whose_turn()
+    moves = list(game.generate_moves(player))
+    if len(moves) == 0:
+        general_pos = SQUARE_NAME[game.get_general_pos(player)]
+        return general_pos, general_pos
+    best_value = -1
+    best_moves = []
+    for start, end in moves:
+        captured = game.search_pos(end)
+        value = 0 if captured is None else PIECE_VALUE[captured.get_role()]
+        if value > best_value:
+            best_value = value
+            best_moves = []
+        if value == best_value:
+            best_moves.append((start, end))
+    start, end = rng.choice(best_moves)
+    return SQUARE_NAME[start], SQUARE_NAME[end]
+
+
+def game_seeds(master_seed, n_games):
+    """
+    Takes two parameters that represent the master seed and the number of games.
+    Returns the list of the seeds of every game, which only depends on the master seed.
+    """
+    rng = random.Random(master_seed)
+    return [rng.getrandbits(64) for _ in range(n_games)]
+
+
+def play_game(task):
+    """
+    Takes a parameter that represents the (index, seed, policy, max_plies) of one game.
+    Plays the game in a new JanggiGame with its own random number generator and returns the compact result:
+    (index, seed, packed record), where the record is the game in the format of JanggiRecord.
+    """
+    index, seed, policy, max_plies = task
+    rng = random.Random(seed)
+    game = JanggiGame()
+    moves = []
+    while game.get_game_state() == "UNFINISHED" and len(moves) < max_plies:
+        start_pos, end_pos = policy(game, rng)
+        # A rejected move ends the game (as if the policy resigned)
+        if game.make_move(start_pos, end_pos) is False:
+            break
+        moves.append((start_pos, end_pos))
+    return index, seed, encode_game(moves, game.get_game_state())
+
+
+class SimulationResult:
+    """
+    Represents the result of one simulated game, which is kept in the compact record format
+    and only unpacked when asked for.
+    """
+
+    def __init__(self, index, seed, record):
+        """
+        Takes three parameters that represent the index of the game, its seed and its packed record.
+        Creates a result object with different private data members and initializes all data members.
+        """
+        self._index = index
+        self._seed = seed
+        self._record = record
+
+    def get_index(self):
+        """
+        Returns the index of the game.
+        """
+        return self._index
+
+    def get_seed(self):
+        """
+        Returns the seed of the game, which replays the same game with play_game.
+        """
+        return self._seed
+
+    def get_record(self):
+        """
+        Returns the packed record of the game (the format of JanggiRecord).
+        """
+        return self._record
+
+    def get_game_state(self):
+        """
+        Returns the final state of the game ("UNFINISHED", "BLUE_WON" or "RED_WON").
+        """
+        return RESULT_NAME.get(self._record[1], "UNFINISHED")
+
+    def get_winner(self):
+        """
+        Returns the winner ("blue" or "red"), or None when the game was stopped unfinished.
+        """
+        game_state = self.get_game_state()
+        if game_state == "BLUE_WON":
+            return "blue"
+        if game_state == "RED_WON":
+            return "red"
+        return None
+
+    def get_plies(self):
+        """
+        Returns the number of moves played.
+        """
+        return GAME_HEADER.unpack_from(self._record, 0)[2]
+
+    def get_moves(self):
+        """
+        Returns the list of the moves as (start, end) pairs of strings (a pass is the General's square twice
+        in the text form, but the PASS_CODE pair here).
+        """
+        return list(decode_moves(memoryview(self._record)[GAME_HEADER.size:]))
+
+    def __repr__(self):
+        """
+        Returns the text form of the result.
+        """
+        return "SimulationResult(index={}, seed={}, winner={}, plies={}, game_state={})".format(
+            self._index, self._seed, self.get_winner(), self.get_plies(), self.get_game_state())
+
+
+def simulate(n_games, policy=random_policy, workers=None, master_seed=0, max_plies=MAX_PLIES, chunk_size=8):
+    """
+    Takes parameters that represent the number of games, the policy (a module-level function that takes the game
+    and a random.Random and returns a (start, end) pair of strings), the number of worker processes (the number
+    of CPUs by default), the master seed, the ply limit and the number of games sent to a worker at once.
+    Yields a SimulationResult for every game in the order of the games. The same master seed gives the same games
+    for any number of workers. With one worker the games are played in this process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = ((index, seed, policy, max_plies) for index, seed in enumerate(game_seeds(master_seed, n_games)))
+    if workers <= 1:
+        for task in tasks:
+            yield SimulationResult(*play_game(task))
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap(play_game, tasks, chunk_size):
+            yield SimulationResult(*result)
+
+
+def write_results(file_obj, results):
+    """
+    Takes two parameters that represent a file opened for binary writing and the simulation results.
+    Writes them as a file of JanggiRecord games (which GameDatabase reads). Returns the number of games written.
+    """
+    file_obj.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+    count = 0
+    for result in results:
+        file_obj.write(result.get_record())
+        count += 1
+    return count
+
+
+if __name__ == '__main__':
+    # Example - plays a small batch of games on every CPU and checks that it is reproducible
+    import time
+
+    start_time = time.perf_counter()
+    results = list(simulate(16, capture_policy, master_seed=2021))
+    print(len(results), "games in", round(time.perf_counter() - start_time, 2), "seconds")
+    for result in results[:4]:
+        print(result)
+    again = list(simulate(16, capture_policy, workers=1, master_seed=2021))
+    print("reproducible:", [r.get_record() for r in results] == [r.get_record() for r in again])
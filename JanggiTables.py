@@ -0,0 +1,309 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: Square ids and the precomputed move tables of every piece role, which are built once at import time.
+
+# Column labels of the board, from left to right
+COLUMN_LABEL = "abcdefghi"
+# Every square has an integer id (0-89) counted row by row from "a1": a1 = 0, i1 = 8, a2 = 9, ..., i10 = 89
+SQUARE_NAME = [column + str(row) for row in range(1, 11) for column in COLUMN_LABEL]
+# Converts the algebraic notation (ex. "b3" and "a10") to the square id
+SQUARE_INDEX = {name: square for square, name in enumerate(SQUARE_NAME)}
+# The row (0-9, row 0 is "1") and the column (0-8, column 0 is "a") of every square id
+SQUARE_ROW = [square // 9 for square in range(90)]
+SQUARE_COL = [square % 9 for square in range(90)]
+
+PLAYERS = ("blue", "red")
+ROLES = ("General", "Guard", "Horse", "Elephant", "Chariot", "Cannon", "Soldier")
+
+
+def get_square(row, column):
+    """
+    Takes two parameters that represent the row (0-9) and the column (0-8).
+    Returns the square id, or None when it is outside the board.
+    """
+    if 0 <= row < 10 and 0 <= column < 9:
+        return row * 9 + column
+    return None
+
+
+# The palaces of the two players
+PALACE = {"red": [SQUARE_INDEX[pos] for pos in ["d1", "d2", "d3", "e1", "e2", "e3", "f1", "f2", "f3"]],
+          "blue": [SQUARE_INDEX[pos] for pos in ["d8", "d9", "d10", "e8", "e9", "e10", "f8", "f9", "f10"]]}
+# The middles of the palace's edges (no diagonal line connects two of them)
+PALACE_EDGE = [SQUARE_INDEX[pos] for pos in ["d2", "e1", "e3", "f2", "d9", "e8", "e10", "f9"]]
+# The diagonal lines of the palaces (corner, center, corner)
+PALACE_DIAGONAL = [[SQUARE_INDEX[pos] for pos in case] for case in
+                   [["d8", "e9", "f10"], ["d10", "e9", "f8"], ["d1", "e2", "f3"], ["d3", "e2", "f1"]]]
+# The diagonal moves of the soldiers inside the enemy palace
+SOLDIER_PALACE_MOVE = {
+    "blue": [(SQUARE_INDEX[start], SQUARE_INDEX[end]) for start, end in
+             [("d3", "e2"), ("f3", "e2"), ("e2", "d1"), ("e2", "f1")]],
+    "red": [(SQUARE_INDEX[start], SQUARE_INDEX[end]) for start, end in
+            [("d8", "e9"), ("f8", "e9"), ("e9", "d10"), ("e9", "f10")]]}
+
+
+def build_palace_step(player):
+    """
+    Takes a parameter that represents the player.
+    Returns the list (indexed by the square id) of the squares that a General or a Guard can step to.
+    """
+    table = []
+    for square in range(90):
+        targets = []
+        for end in PALACE[player]:
+            if end == square:
+                continue
+            if abs(SQUARE_ROW[end] - SQUARE_ROW[square]) > 1 or abs(SQUARE_COL[end] - SQUARE_COL[square]) > 1:
+                continue
+            # Special Case (no diagonal line between the middles of the palace's edges)
+            if square in PALACE_EDGE and end in PALACE_EDGE:
+                continue
+            targets.append(end)
+        table.append(tuple(targets))
+    return table
+
+
+def build_soldier_step(player):
+    """
+    Takes a parameter that represents the player.
+    Returns the list (indexed by the square id) of the squares that a Soldier can step to.
+    """
+    # Soldiers cannot move backward (blue moves toward row "1", red moves toward row "10")
+    forward = -1 if player == "blue" else 1
+    table = []
+    for square in range(90):
+        row, column = SQUARE_ROW[square], SQUARE_COL[square]
+        targets = [get_square(row, column - 1), get_square(row, column + 1), get_square(row + forward, column)]
+        # Soldiers may also move one point diagonally "forward" when within the enemy palace
+        targets += [end for start, end in SOLDIER_PALACE_MOVE[player] if start == square]
+        table.append(tuple(end for end in targets if end is not None))
+    return table
+
+
+def build_horse_move():
+    """
+    Returns the list (indexed by the square id) of the Horse's (leg, target) pairs.
+    The Horse moves one step orthogonally (the leg, which blocks it when occupied),
+    then one step diagonally outward.
+    """
+    table = []
+    for square in range(90):
+        row, column = SQUARE_ROW[square], SQUARE_COL[square]
+        moves = []
+        for row_step, col_step in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            leg = get_square(row + row_step, column + col_step)
+            if leg is None:
+                continue
+            for side in (1, -1):
+                if row_step != 0:
+                    target = get_square(row + 2 * row_step, column + side)
+                else:
+                    target = get_square(row + side, column + 2 * col_step)
+                if target is not None:
+                    moves.append((leg, target))
+        table.append(tuple(moves))
+    return table
+
+
+def build_elephant_move():
+    """
+    Returns the list (indexed by the square id) of the Elephant's ((first leg, second leg), target) pairs.
+    The Elephant moves one step orthogonally, then two steps diagonally outward,
+    and it is blocked when any of the two squares passed through is occupied.
+    """
+    table = []
+    for square in range(90):
+        row, column = SQUARE_ROW[square], SQUARE_COL[square]
+        moves = []
+        for row_step, col_step in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            first_leg = get_square(row + row_step, column + col_step)
+            if first_leg is None:
+                continue
+            for side in (1, -1):
+                if row_step != 0:
+                    second_leg = get_square(row + 2 * row_step, column + side)
+                    target = get_square(row + 3 * row_step, column + 2 * side)
+                else:
+                    second_leg = get_square(row + side, column + 2 * col_step)
+                    target = get_square(row + 2 * side, column + 3 * col_step)
+                if second_leg is not None and target is not None:
+                    moves.append(((first_leg, second_leg), target))
+        table.append(tuple(moves))
+    return table
+
+
+def build_orthogonal_ray():
+    """
+    Returns the list (indexed by the square id) of the four orthogonal rays (up, down, right, left),
+    each one ordered outward from the square.
+    """
+    table = []
+    for square in range(90):
+        row, column = SQUARE_ROW[square], SQUARE_COL[square]
+        rays = []
+        for row_step, col_step in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            ray = []
+            end = get_square(row + row_step, column + col_step)
+            while end is not None:
+                ray.append(end)
+                end = get_square(SQUARE_ROW[end] + row_step, SQUARE_COL[end] + col_step)
+            rays.append(tuple(ray))
+        table.append(tuple(rays))
+    return table
+
+
+def build_palace_ray():
+    """
+    Returns the list (indexed by the square id) of the diagonal rays along the palace's lines,
+    each one ordered outward from the square.
+    """
+    table = [[] for _ in range(90)]
+    for case in PALACE_DIAGONAL:
+        for line in (case, case[::-1]):
+            for index, square in enumerate(line[:-1]):
+                table[square].append(tuple(line[index + 1:]))
+    return [tuple(rays) for rays in table]
+
+
+def build_line_between():
+    """
+    Returns the 90 x 90 table of the squares between two squares on the same line
+    (row, column or palace diagonal), or None when they are not on the same line.
+    """
+    table = [[None] * 90 for _ in range(90)]
+    for square in range(90):
+        for ray in ORTHOGONAL_RAY[square] + PALACE_RAY[square]:
+            for index, end in enumerate(ray):
+                table[square][end] = ray[:index]
+    return table
+
+
+# Target squares of the General and the Guard (indexed by player, then by square id)
+PALACE_STEP = {player: build_palace_step(player) for player in PLAYERS}
+# Target squares of the Soldier (indexed by player, then by square id)
+SOLDIER_STEP = {player: build_soldier_step(player) for player in PLAYERS}
+# (leg, target) pairs of the Horse and ((first leg, second leg), target) pairs of the Elephant
+HORSE_MOVE = build_horse_move()
+ELEPHANT_MOVE = build_elephant_move()
+# Sliding rays of the Chariot and the Cannon
+ORTHOGONAL_RAY = build_orthogonal_ray()
+PALACE_RAY = build_palace_ray()
+LINE_BETWEEN = build_line_between()
+
+# Maps each (role, player) to the step targets of every square (the roles that cannot be blocked)
+STEP_TABLE = {(role, player): (SOLDIER_STEP if role == "Soldier" else PALACE_STEP)[player]
+              for role in ("General", "Guard", "Soldier") for player in PLAYERS}
+
+
+def build_zobrist(seed):
+    """
+    Takes a parameter that represents the random seed (fixed, so the hashes are the same in every process).
+    Returns the dictionary that maps every (player, role) to the random 64-bit keys of the 90 squares,
+    and the random 64-bit key of the red player to move.
+    """
+    state = [seed]
+
+    def next_key():
+        # SplitMix64 (needs no import, which keeps the start-up of the rules engine short)
+        state[0] = (state[0] + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        key = state[0]
+        key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        return key ^ (key >> 31)
+
+    keys = {(player, role): [next_key() for _ in range(90)] for player in PLAYERS for role in ROLES}
+    return keys, next_key()
+
+
+# Zobrist keys of the pieces on the squares and of the side to move
+ZOBRIST_PIECE, ZOBRIST_RED_TURN = build_zobrist(0x4A414E474749)
+
+# Standard material values of the pieces
+PIECE_VALUE = {"General": 0, "Chariot": 13, "Cannon": 7, "Horse": 5, "Elephant": 3, "Guard": 3, "Soldier": 2}
+# The evaluation is counted in hundredths of a material point
+EVAL_SCALE = 100
+# The positional bonuses of every role in hundredths, as rows of the board from the owner's back rank (row 0)
+# to the enemy's back rank (row 9), so the same table serves both players (the missing rows are 0)
+POSITION_BONUS = {
+    "General": ((0, 0, 0, 0, 5, 0, 0, 0, 0),
+                (0, 0, 0, 5, 10, 5, 0, 0, 0),
+                (0, 0, 0, -5, 0, -5, 0, 0, 0)),
+    "Guard": ((0, 0, 0, 5, 0, 5, 0, 0, 0),
+              (0, 0, 0, 0, 10, 0, 0, 0, 0),
+              (0, 0, 0, 0, 0, 0, 0, 0, 0)),
+    "Elephant": ((0, 0, 0, 0, 0, 0, 0, 0, 0),
+                 (0, 0, 5, 0, 0, 0, 5, 0, 0),
+                 (-5, 5, 10, 5, 10, 5, 10, 5, -5),
+                 (-5, 0, 10, 10, 10, 10, 10, 0, -5),
+                 (-5, 5, 10, 10, 15, 10, 10, 5, -5),
+                 (-5, 0, 5, 10, 10, 10, 5, 0, -5),
+                 (-10, 0, 5, 5, 5, 5, 5, 0, -10),
+                 (-10, -5, 0, 0, 0, 0, 0, -5, -10),
+                 (-10, -5, 0, 0, 0, 0, 0, -5, -10),
+                 (-10, -5, 0, 0, 0, 0, 0, -5, -10)),
+    "Horse": ((-20, -10, 0, -5, -10, -5, 0, -10, -20),
+              (-10, 0, 5, 5, 0, 5, 5, 0, -10),
+              (-5, 5, 10, 10, 10, 10, 10, 5, -5),
+              (-5, 5, 10, 15, 15, 15, 10, 5, -5),
+              (0, 10, 15, 20, 20, 20, 15, 10, 0),
+              (0, 10, 15, 20, 20, 20, 15, 10, 0),
+              (0, 10, 15, 20, 25, 20, 15, 10, 0),
+              (-5, 5, 10, 20, 20, 20, 10, 5, -5),
+              (-10, 0, 5, 10, 10, 10, 5, 0, -10),
+              (-20, -10, -5, 0, 0, 0, -5, -10, -20)),
+    "Chariot": ((-5, 0, 0, 5, 5, 5, 0, 0, -5),
+                (0, 5, 5, 5, 5, 5, 5, 5, 0),
+                (0, 5, 5, 10, 10, 10, 5, 5, 0),
+                (0, 5, 5, 10, 10, 10, 5, 5, 0),
+                (5, 10, 10, 15, 15, 15, 10, 10, 5),
+                (5, 10, 10, 15, 15, 15, 10, 10, 5),
+                (10, 15, 15, 20, 20, 20, 15, 15, 10),
+                (10, 15, 15, 25, 25, 25, 15, 15, 10),
+                (10, 15, 15, 25, 30, 25, 15, 15, 10),
+                (5, 10, 10, 20, 20, 20, 10, 10, 5)),
+    "Cannon": ((0, 0, 5, 10, 10, 10, 5, 0, 0),
+               (0, 5, 5, 5, 15, 5, 5, 5, 0),
+               (5, 10, 5, 10, 15, 10, 5, 10, 5),
+               (0, 5, 5, 5, 10, 5, 5, 5, 0),
+               (0, 0, 5, 5, 10, 5, 5, 0, 0),
+               (0, 0, 0, 5, 10, 5, 0, 0, 0),
+               (0, 0, 0, 5, 10, 5, 0, 0, 0),
+               (0, 0, 0, 10, 15, 10, 0, 0, 0),
+               (0, 0, 0, 5, 20, 5, 0, 0, 0),
+               (0, 0, 0, 10, 10, 10, 0, 0, 0)),
+    "Soldier": ((0, 0, 0, 0, 0, 0, 0, 0, 0),
+                (0, 0, 0, 0, 0, 0, 0, 0, 0),
+                (0, 0, 0, 0, 0, 0, 0, 0, 0),
+                (0, 0, 0, 0, 0, 0, 0, 0, 0),
+                (5, 5, 10, 10, 15, 10, 10, 5, 5),
+                (10, 15, 20, 25, 30, 25, 20, 15, 10),
+                (15, 20, 30, 40, 45, 40, 30, 20, 15),
+                (20, 25, 35, 50, 55, 50, 35, 25, 20),
+                (20, 25, 35, 55, 65, 55, 35, 25, 20),
+                (10, 15, 25, 40, 30, 40, 25, 15, 10))}
+
+
+def build_piece_square():
+    """
+    Returns the dictionary that maps every (player, role) to the values of the piece on the 90 squares
+    (the material value and the positional bonus in hundredths), and the same values from blue's view
+    (red's are negated), which are added up into the score of a position.
+    """
+    values = {}
+    blue_view = {}
+    for player in PLAYERS:
+        for role in ROLES:
+            bonus = POSITION_BONUS[role]
+            table = []
+            for square in range(90):
+                # Red's back rank is row 0 of the board, blue's is row 9
+                row = SQUARE_ROW[square] if player == "red" else 9 - SQUARE_ROW[square]
+                extra = bonus[row][SQUARE_COL[square]] if row < len(bonus) else 0
+                table.append(PIECE_VALUE[role] * EVAL_SCALE + extra)
+            values[(player, role)] = tuple(table)
+            blue_view[(player, role)] = tuple(table) if player == "blue" else tuple(-value for value in table)
+    return values, blue_view
+
+
+# The values of the pieces on the squares, and the same values from blue's view
+PIECE_SQUARE, PIECE_SQUARE_BLUE = build_piece_square()
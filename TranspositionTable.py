@@ -0,0 +1,159 @@
+# Author: Cheng-Ying Wu
+# Date: 10/17/2026
+# Description: A transposition table with a fixed memory budget for caching search results by position hash.
+from array import array
+
+# The kinds of the stored scores
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+# Bytes used by one entry: key (8), score (4), move (2), depth (1), flag (1) and generation (1)
+ENTRY_BYTES = 17
+# Every bucket has two entries: slot 0 keeps the deeper result, slot 1 is always replaced
+BUCKET_SIZE = 2
+
+
+class TranspositionTable:
+    """
+    Represents a transposition table whose entries are packed into preallocated arrays,
+    so the memory stays flat no matter how many positions are stored.
+    """
+
+    def __init__(self, size_mb=16):
+        """
+        Takes an optional parameter that represents the memory budget in MB.
+        Creates the table with different private data members and initializes all data members.
+        """
+        if size_mb <= 0:
+            raise ValueError("The memory budget must be positive.")
+        self._buckets = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * BUCKET_SIZE))
+        entries = self._buckets * BUCKET_SIZE
+        # The packed entries (a key of 0 marks an empty entry)
+        self._keys = array("Q", bytes(8 * entries))
+        self._scores = array("i", bytes(4 * entries))
+        self._moves = array("H", bytes(2 * entries))
+        self._depths = array("b", bytes(entries))
+        self._flags = array("B", bytes(entries))
+        self._generations = array("B", bytes(entries))
+        # The current search generation, which lets new searches replace the results of the old ones
+        self._generation = 0
+        # Counters
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+        self._stores = 0
+        self._replacements = 0
+        self._used = 0
+
+    def get_capacity(self):
+        """
+        Returns the number of entries the table can hold.
+        """
+        return self._buckets * BUCKET_SIZE
+
+    def get_size_bytes(self):
+        """
+        Returns the memory used by the packed entries in bytes.
+        """
+        return self.get_capacity() * ENTRY_BYTES
+
+    def get_stats(self):
+        """
+        Returns a dictionary of the counters: hits, misses, collisions (a different position in the bucket),
+        stores, replacements (a different position overwritten) and the number of used entries.
+        """
+        return {"hits": self._hits, "misses": self._misses, "collisions": self._collisions, "stores": self._stores,
+                "replacements": self._replacements, "used": self._used, "capacity": self.get_capacity()}
+
+    def new_search(self):
+        """
+        Starts a new search generation, so the entries of the older searches are replaced first.
+        """
+        self._generation = (self._generation + 1) % 256
+
+    def clear(self):
+        """
+        Empties the table and resets the counters.
+        """
+        entries = self.get_capacity()
+        self._keys = array("Q", bytes(8 * entries))
+        self._scores = array("i", bytes(4 * entries))
+        self._moves = array("H", bytes(2 * entries))
+        self._depths = array("b", bytes(entries))
+        self._flags = array("B", bytes(entries))
+        self._generations = array("B", bytes(entries))
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._collisions = 0
+        self._stores = 0
+        self._replacements = 0
+        self._used = 0
+
+    def probe(self, key):
+        """
+        Takes a parameter that represents the position hash (64-bit).
+        Returns the (depth, score, flag, move) of the stored result, or None when the position is not stored.
+        The move is a (start square id, end square id) pair, or None.
+        """
+        index = (key % self._buckets) * BUCKET_SIZE
+        keys = self._keys
+        for slot in range(index, index + BUCKET_SIZE):
+            if keys[slot] == key:
+                self._hits += 1
+                return self._depths[slot], self._scores[slot], self._flags[slot], decode_move(self._moves[slot])
+        self._misses += 1
+        if keys[index] != 0 or keys[index + 1] != 0:
+            self._collisions += 1
+        return None
+
+    def store(self, key, depth, score, flag, move=None):
+        """
+        Takes parameters that represent the position hash, the searched depth, the score, the kind of the score
+        (EXACT, LOWER_BOUND or UPPER_BOUND) and the best move ((start, end) square ids or None).
+        Stores the result: slot 0 keeps the deepest (or newest generation) result and slot 1 is always replaced.
+        """
+        index = (key % self._buckets) * BUCKET_SIZE
+        keys = self._keys
+        depth = max(-128, min(127, depth))
+        if keys[index] == key or keys[index] == 0 or self._generations[index] != self._generation \
+                or depth >= self._depths[index]:
+            slot = index
+        else:
+            slot = index + 1
+        # Keeps the old best move when the same position is stored again without one
+        if move is None and keys[slot] == key:
+            encoded = self._moves[slot]
+        else:
+            encoded = encode_move(move)
+        if keys[slot] == 0:
+            self._used += 1
+        elif keys[slot] != key:
+            self._replacements += 1
+        self._stores += 1
+        keys[slot] = key
+        self._depths[slot] = depth
+        self._scores[slot] = max(-2147483648, min(2147483647, score))
+        self._flags[slot] = flag
+        self._moves[slot] = encoded
+        self._generations[slot] = self._generation
+
+
+def encode_move(move):
+    """
+    Takes a parameter that represents a (start square id, end square id) pair or None.
+    Returns the move packed into 16 bits (0 when there is no move).
+    """
+    if move is None:
+        return 0
+    return move[0] * 90 + move[1] + 1
+
+
+def decode_move(encoded):
+    """
+    Takes a parameter that represents a move packed by encode_move.
+    Returns the (start square id, end square id) pair, or None.
+    """
+    if encoded == 0:
+        return None
+    return divmod(encoded - 1, 90)